@@ -1,19 +1,144 @@
+from datetime import datetime, timedelta
+import re
+from typing import ClassVar, List, Optional, Tuple
+
 from sqladmin import Admin, ModelView
-from .database import engine
+from sqlalchemy import Select, func, or_, select, text
+from sqlalchemy.orm import load_only
+from starlette.requests import Request
+
+from .database import engine, IS_SQLITE
 from .models import WorkSession, PriorityItem, ResourceLink
 
-class WorkSessionAdmin(ModelView, model=WorkSession):
+
+# 큰 테이블용 공통 설정
+#  - 목록은 column_list 컬럼만 SELECT (JSON 등 무거운 컬럼은 상세 화면에서만)
+#  - 검색/필터/정렬은 인덱스가 있는 컬럼만 (부분 문자열 ILIKE 대신 일치/접두사/범위)
+#  - 필터 없는 목록의 전체 건수: Postgres는 pg_class.reltuples 추정치(ANALYZE 기준),
+#    ESTIMATE_MIN 미만이거나 통계가 없으면 정확한 COUNT
+class ScalableModelView(ModelView):
+    page_size = 25
+    page_size_options = [25, 50, 100]
+    ESTIMATE_MIN: ClassVar[int] = 10_000
+
+    def _list_columns(self) -> List:
+        return [getattr(self.model, name) for name in self._list_prop_names]
+
+    def apply_filters(self, stmt: Select, request: Request) -> Select:
+        """URL 쿼리 파라미터 필터 (뷰별로 재정의)"""
+        return stmt
+
+    def _has_filters(self, request: Request) -> bool:
+        return False
+
+    def list_query(self, request: Request) -> Select:
+        stmt = select(self.model).options(load_only(*self._list_columns()))
+        return self.apply_filters(stmt, request)
+
+    def count_query(self, request: Request) -> Select:
+        return self.apply_filters(select(func.count(self.pk_columns[0])), request)
+
+    async def count(self, request: Request, stmt: Optional[Select] = None) -> int:
+        if stmt is None and not IS_SQLITE and not self._has_filters(request):
+            est = await self._run_query(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)")
+                .bindparams(t=self.model.__tablename__)
+            )
+            if est and est[0] is not None and est[0] >= self.ESTIMATE_MIN:
+                return int(est[0])
+        return await super().count(request, stmt)
+
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}(-\d{2})?$")
+
+
+def _date_range(term: str) -> Optional[Tuple[datetime, datetime]]:
+    """'2026-10' → 그 달, '2026-10-19' → 그 날 (KST naive)"""
+    if not _DATE_RE.match(term):
+        return None
+    try:
+        if len(term) == 7:
+            start = datetime.strptime(term, "%Y-%m")
+            y, m = (start.year + 1, 1) if start.month == 12 else (start.year, start.month + 1)
+            return start, datetime(y, m, 1)
+        start = datetime.strptime(term, "%Y-%m-%d")
+        return start, start + timedelta(days=1)
+    except ValueError:
+        return None
+
+
+def _prefix(col, term: str):
+    # LIKE 'x%' 는 DB/콜레이션에 따라 인덱스를 못 타므로 범위 비교로 접두사 검색
+    return (col >= term) & (col < term + "\uffff")
+
+
+class WorkSessionAdmin(ScalableModelView, model=WorkSession):
     name = "근무기록"
-    column_list = [WorkSession.id, WorkSession.started_at, WorkSession.ended_at, WorkSession.minutes, WorkSession.memo]
-    form_columns = [WorkSession.started_at, WorkSession.ended_at, WorkSession.memo]
+    column_list = [WorkSession.id, WorkSession.user_id, WorkSession.started_at, WorkSession.ended_at, WorkSession.minutes, WorkSession.memo]
+    form_columns = [WorkSession.user_id, WorkSession.started_at, WorkSession.ended_at, WorkSession.memo]
+    # 검색: 사용자 id(일치) 또는 날짜(YYYY-MM / YYYY-MM-DD → started_at 범위)
+    # 필터(URL): ?user_id=...&start=YYYY-MM-DD&end=YYYY-MM-DD
+    column_searchable_list = [WorkSession.user_id, WorkSession.started_at]
+    column_sortable_list = [WorkSession.id, WorkSession.started_at, WorkSession.ended_at]
+    column_default_sort = ("started_at", True)
+
+    def _has_filters(self, request: Request) -> bool:
+        q = request.query_params
+        return any(q.get(k) for k in ("user_id", "start", "end"))
+
+    def apply_filters(self, stmt: Select, request: Request) -> Select:
+        q = request.query_params
+        if q.get("user_id"):
+            stmt = stmt.where(WorkSession.user_id == q["user_id"])
+        for key, op in (("start", "__ge__"), ("end", "__lt__")):
+            r = _date_range(q.get(key) or "")
+            if r:
+                stmt = stmt.where(getattr(WorkSession.started_at, op)(r[0]))
+        return stmt
+
+    def search_query(self, stmt: Select, term: str) -> Select:
+        term = term.strip()
+        r = _date_range(term)
+        if r:
+            return stmt.where(WorkSession.started_at >= r[0], WorkSession.started_at < r[1])
+        return stmt.where(WorkSession.user_id == term)
 
-class PriorityItemAdmin(ModelView, model=PriorityItem):
+
+class PriorityItemAdmin(ScalableModelView, model=PriorityItem):
     name = "우선순위"
-    column_list = "__all__"
+    # flags/links(JSON)는 목록에서 제외 → 상세/수정 화면에서만 로드
+    column_list = [
+        PriorityItem.id, PriorityItem.user_id, PriorityItem.book,
+        PriorityItem.due_weekday, PriorityItem.due_hour, PriorityItem.due_minute,
+        PriorityItem.completed_week_start, PriorityItem.memo,
+    ]
+    # 검색: 책 이름 접두사 또는 사용자 id 일치
+    column_searchable_list = [PriorityItem.book, PriorityItem.user_id]
+    column_sortable_list = [PriorityItem.id, PriorityItem.book, PriorityItem.due_weekday]
+    column_default_sort = [("due_weekday", False), ("id", False)]
+
+    def _has_filters(self, request: Request) -> bool:
+        return bool(request.query_params.get("user_id"))
+
+    def apply_filters(self, stmt: Select, request: Request) -> Select:
+        user_id = request.query_params.get("user_id")
+        return stmt.where(PriorityItem.user_id == user_id) if user_id else stmt
 
-class ResourceLinkAdmin(ModelView, model=ResourceLink):
+    def search_query(self, stmt: Select, term: str) -> Select:
+        term = term.strip()
+        return stmt.where(or_(_prefix(PriorityItem.book, term), PriorityItem.user_id == term))
+
+
+class ResourceLinkAdmin(ScalableModelView, model=ResourceLink):
     name = "링크"
-    column_list = "__all__"
+    column_list = [ResourceLink.id, ResourceLink.title, ResourceLink.url, ResourceLink.category, ResourceLink.updated_at]
+    # 작은 테이블: 제목 접두사 검색만
+    column_searchable_list = [ResourceLink.title]
+    column_sortable_list = [ResourceLink.id, ResourceLink.title]
+    column_default_sort = ("id", True)
+
+    def search_query(self, stmt: Select, term: str) -> Select:
+        return stmt.where(_prefix(ResourceLink.title, term.strip()))
 
 def setup_admin(app):
     admin = Admin(app, engine)
@@ -0,0 +1,157 @@
+# backend/app/analytics.py
+# 근무 패턴 분석 (/timer/analytics)
+#  - 기간과 겹치는 종료된 세션의 (시작, 종료)만 읽어 int64 초 배열 두 개로 보관
+#  - 세션을 정시 경계에서 벡터 연산으로 분할 → 요일×시간 히트맵(분)
+#  - 세션 길이(분) 히스토그램 + 백분위
+#  - 결과는 (사용자, 기간, 구간) 단위로 메모리에 캐시. 기간 내 MAX(version)/건수가 같으면 재사용
+#  - 시각은 DB와 같은 KST naive 기준(에폭 초로 변환해 계산, 시간대 보정 없음)
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from .models import WorkSession
+from .settings import settings
+
+HOUR = 3600
+DAY = 86400
+PERCENTILES = (50, 75, 90, 95, 99)
+DEFAULT_BINS = (0, 15, 30, 60, 90, 120, 180, 240, 360, 480, 720)
+WEEKDAYS = ("월", "화", "수", "목", "금", "토", "일")
+
+
+def _range_filter(user_id: str, start: datetime, end: datetime):
+    # 기간과 겹치는 세션: started_at < end AND ended_at > start (started_at 인덱스로 상한 제한)
+    return (
+        WorkSession.user_id == user_id,
+        WorkSession.started_at < end,
+        WorkSession.ended_at > start,
+    )
+
+
+def load_columns(session: Session, user_id: str, start: datetime, end: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """(시작 초, 종료 초) int64 배열. ORM 객체를 만들지 않고 두 컬럼만 조회"""
+    rows = session.exec(
+        select(WorkSession.started_at, WorkSession.ended_at).where(*_range_filter(user_id, start, end))
+    ).all()
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    starts, ends = zip(*rows)
+    s = np.array(starts, dtype="datetime64[s]").astype(np.int64)
+    e = np.array(ends, dtype="datetime64[s]").astype(np.int64)
+    return s, e
+
+
+def hour_split(s: np.ndarray, e: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """[s, e) 구간들을 정시 단위 조각으로 분할 → (조각이 속한 정시 초, 조각 길이 초)"""
+    h0 = s // HOUR
+    h1 = -(-e // HOUR)  # ceil
+    counts = np.maximum(h1 - h0, 0)
+    idx = np.repeat(np.arange(len(s)), counts)
+    # 세션 안에서의 조각 순번 0..counts-1
+    offset = np.arange(len(idx)) - np.repeat(np.cumsum(counts) - counts, counts)
+    slot = (h0[idx] + offset) * HOUR
+    secs = np.minimum(e[idx], slot + HOUR) - np.maximum(s[idx], slot)
+    return slot, secs
+
+
+def heatmap(s: np.ndarray, e: np.ndarray) -> np.ndarray:
+    """7×24 (월요일=0) 근무 분"""
+    slot, secs = hour_split(s, e)
+    weekday = (slot // DAY + 3) % 7  # 1970-01-01 = 목요일
+    hour = (slot // HOUR) % 24
+    grid = np.bincount(weekday * 24 + hour, weights=secs, minlength=7 * 24)
+    return (grid / 60).reshape(7, 24)
+
+
+def length_stats(minutes: np.ndarray, bins: Sequence[int]) -> dict:
+    edges = np.asarray(sorted(set(bins)), dtype=np.float64)
+    # 마지막 구간 이후 값도 세도록 상한을 무한대로 열어 둠
+    counts, _ = np.histogram(minutes, bins=np.append(edges, np.inf))
+    stats = {
+        "count": int(minutes.size),
+        "histogram": [
+            {"from": int(lo), "to": (int(hi) if np.isfinite(hi) else None), "count": int(c)}
+            for lo, hi, c in zip(edges, np.append(edges[1:], np.inf), counts)
+        ],
+    }
+    if minutes.size:
+        pv = np.percentile(minutes, PERCENTILES)
+        stats["mean"] = round(float(minutes.mean()), 1)
+        stats["percentiles"] = {f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, pv)}
+    else:
+        stats["mean"] = None
+        stats["percentiles"] = {f"p{p}": None for p in PERCENTILES}
+    return stats
+
+
+def compute(s: np.ndarray, e: np.ndarray, start: datetime, end: datetime, bins: Sequence[int]) -> dict:
+    lo = np.datetime64(start, "s").astype(np.int64)
+    hi = np.datetime64(end, "s").astype(np.int64)
+    cs, ce = np.clip(s, lo, hi), np.clip(e, lo, hi)  # 히트맵은 기간 안쪽만
+    grid = heatmap(cs, ce)
+    return {
+        "total_minutes": round(float(grid.sum()), 1),
+        "heatmap": {
+            "weekdays": list(WEEKDAYS),
+            "minutes": np.round(grid, 1).tolist(),
+            "by_weekday": np.round(grid.sum(axis=1), 1).tolist(),
+            "by_hour": np.round(grid.sum(axis=0), 1).tolist(),
+        },
+        # 길이 분포는 잘리지 않은 세션 전체 길이 기준
+        "lengths": length_stats((e - s) // 60, bins),
+    }
+
+
+class _Cache:
+    """(사용자, 기간, 구간) → (data_key, 결과). 최근 사용 순으로 ANALYTICS_CACHE_SIZE 개 유지"""
+
+    def __init__(self):
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, data_key):
+        with self._lock:
+            hit = self._items.get(key)
+            if hit is None or hit[0] != data_key:
+                return None
+            self._items.move_to_end(key)
+            return hit[1]
+
+    def put(self, key, data_key, value) -> None:
+        with self._lock:
+            self._items[key] = (data_key, value)
+            self._items.move_to_end(key)
+            while len(self._items) > settings.ANALYTICS_CACHE_SIZE:
+                self._items.popitem(last=False)
+
+
+_cache = _Cache()
+
+
+def data_key(session: Session, user_id: str, start: datetime, end: datetime) -> tuple:
+    return tuple(session.exec(
+        select(func.coalesce(func.max(WorkSession.version), 0), func.count())
+        .where(*_range_filter(user_id, start, end))
+    ).one())
+
+
+def analytics(
+    session: Session, user_id: str, start: datetime, end: datetime, bins: Optional[Sequence[int]] = None,
+) -> Tuple[dict, bool]:
+    """(결과, 캐시 적중 여부)"""
+    bins = tuple(sorted(set(bins or DEFAULT_BINS)))
+    key = (user_id, start, end, bins)
+    dk = data_key(session, user_id, start, end)
+    hit = _cache.get(key, dk)
+    if hit is not None:
+        return hit, True
+    s, e = load_columns(session, user_id, start, end)
+    result = compute(s, e, start, end, bins)
+    _cache.put(key, dk, result)
+    return result, False
@@ -0,0 +1,66 @@
+# backend/app/changes.py
+# 변경 추적(delta 동기화)
+#  - 행 쓰기: 모델의 version/updated_at 컬럼 기본값/갱신값이 자동 처리 (models.next_version)
+#  - 삭제: Tombstone 행을 남겨 ?since= 조회에서 "삭제된 id" 로 내려줌
+#  - ORM 삭제(sqladmin 등)는 mapper 이벤트로, 라우터의 DELETE ... RETURNING 은 record_tombstone 으로 기록
+from typing import List, Optional, Tuple, Type
+
+from sqlalchemy import event, insert
+from sqlmodel import SQLModel, Session, select
+
+from .models import WorkSession, PriorityItem, ResourceLink, Tombstone, VersionCounter, next_version
+
+TRACKED: Tuple[Type[SQLModel], ...] = (WorkSession, PriorityItem, ResourceLink)
+
+
+def _insert_tombstone(conn, model: Type[SQLModel], row_id: int, user_id: Optional[str]) -> None:
+    table = model.__tablename__
+    conn.execute(insert(Tombstone).values(
+        table_name=table, row_id=row_id, user_id=user_id, version=next_version(conn, table),
+    ))
+
+
+def record_tombstone(session: Session, model: Type[SQLModel], row_id: int, user_id: Optional[str] = None) -> None:
+    """삭제와 같은 트랜잭션 안에서 호출 (커밋은 호출 측)"""
+    _insert_tombstone(session.connection(), model, row_id, user_id)
+
+
+def _before_orm_delete(mapper, connection, target):
+    _insert_tombstone(connection, type(target), target.id, getattr(target, "user_id", None))
+
+
+for _model in TRACKED:
+    event.listen(_model, "before_delete", _before_orm_delete)
+
+
+def current_version(session: Session, model: Type[SQLModel]) -> int:
+    """지금까지 커밋된 마지막 version (카운터 값). 전체 조회 전에 읽어 두면
+    조회 도중/이후의 쓰기·삭제는 모두 이 값보다 큰 version 으로 다음 증분에 잡힘"""
+    v = session.exec(
+        select(VersionCounter.v).where(VersionCounter.table_name == model.__tablename__)
+    ).first()
+    return v or 0
+
+
+def changes_since(
+    session: Session, model: Type[SQLModel], since: int, user_id: Optional[str] = None,
+) -> Tuple[list, List[int], int]:
+    """since 이후 바뀐 행, 삭제된 id, 다음 요청에 쓸 version 커서를 반환.
+    user_id를 주면 그 사용자 소유 행/삭제 기록만 ((user_id, version) 인덱스 범위 조회)"""
+    row_q = select(model).where(model.version > since)
+    tomb_q = select(Tombstone.row_id, Tombstone.version).where(
+        Tombstone.table_name == model.__tablename__, Tombstone.version > since,
+    )
+    if user_id is not None:
+        row_q = row_q.where(model.user_id == user_id)
+        tomb_q = tomb_q.where(Tombstone.user_id == user_id)
+    rows = session.exec(row_q.order_by(model.version)).all()
+    deleted = session.exec(tomb_q.order_by(Tombstone.version)).all()
+    # 삭제 후 같은 id로 다시 생긴 경우는 없지만(자동증가), 방어적으로 살아있는 id는 제외
+    alive = {r.id for r in rows}
+    deleted_ids = [rid for rid, _ in deleted if rid not in alive]
+    cursor = max(
+        [since] + [r.version for r in rows if r.version is not None] + [v for _, v in deleted]
+    )
+    return rows, deleted_ids, cursor
+
@@ -0,0 +1,156 @@
+# backend/app/compression.py
+# 응답 압축 (ASGI 미들웨어)
+#  - Accept-Encoding 협상: br(brotli 모듈이 있을 때) > gzip, q=0 은 제외
+#  - 한 번에 끝나는 응답: COMPRESS_MIN_SIZE 미만이면 그대로, 이상이면 통째로 압축 + Content-Length 갱신
+#  - StreamingResponse(CSV/Parquet 내보내기 등): 조각마다 압축 후 flush 해서 바로 전송 → 전체 본문을 모으지 않음
+#  - 이미 압축된 형식(Parquet/이미지/zip …)과 SSE(text/event-stream)는 건너뜀
+#  - 부분 응답(206 / Content-Range)도 건너뜀: 범위는 원문 바이트 기준이라 압축하면 맞지 않음
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .settings import settings
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만
+    brotli = None
+
+
+def choose_encoding(accept: str) -> Optional[str]:
+    """Accept-Encoding 에서 사용할 인코딩 선택"""
+    q = {}
+    for part in accept.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        q[name] = weight
+    wildcard = q.get("*", 0.0)
+    candidates = (("br",) if brotli is not None else ()) + ("gzip",)
+    best = max(candidates, key=lambda e: q.get(e, wildcard))
+    return best if q.get(best, wildcard) > 0 else None
+
+
+class _Encoder:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=settings.COMPRESS_BROTLI_QUALITY)
+        else:
+            # wbits 16+ → gzip 헤더/트레일러
+            self._c = zlib.compressobj(settings.COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """스트리밍용: 지금까지 받은 데이터를 클라이언트가 바로 풀 수 있게 flush"""
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.finish()
+        return self._c.compress(data) + self._c.flush(zlib.Z_FINISH)
+
+
+def _compressible(status: int, headers: Headers) -> bool:
+    if status == 206 or "content-range" in headers or "content-encoding" in headers:
+        return False
+    ctype = headers.get("content-type", "").split(";")[0].strip().lower()
+    return not any(ctype.startswith(p) for p in settings.COMPRESS_EXCLUDE_TYPES)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _Responder(self.app, encoding).run(scope, receive, send)
+
+
+class _Responder:
+    def __init__(self, app: ASGIApp, encoding: str):
+        self.app = app
+        self.encoding = encoding
+        self.start: Optional[Message] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.on_send)
+
+    def _encoded_start(self, length: Optional[int]) -> Message:
+        start, self.start = self.start, None
+        headers = MutableHeaders(scope=start)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        return start
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # 첫 본문 조각을 보고 결정하므로 시작 메시지는 잠시 보류
+            self.start = message
+            self.passthrough = not _compressible(message["status"], Headers(raw=message["headers"]))
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+
+        if self.passthrough:
+            if self.start is not None:
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+            return
+
+        if self.encoder is None and self.start is not None:
+            if not more:
+                # 본문 한 번에 끝 → 크기 기준으로 판단
+                if len(body) < settings.COMPRESS_MIN_SIZE:
+                    await self.send(self.start)
+                    self.start = None
+                    await self.send(message)
+                    return
+                data = _Encoder(self.encoding).finish(body)
+                await self.send(self._encoded_start(len(data)))
+                await self.send({"type": "http.response.body", "body": data})
+                return
+            # 스트리밍: 길이를 모르므로 chunked 로 압축 전송
+            self.encoder = _Encoder(self.encoding)
+            await self.send(self._encoded_start(None))
+
+        if self.encoder is None:  # 이미 원문으로 보낸 응답의 나머지
+            await self.send(message)
+            return
+        data = self.encoder.chunk(body) if more else self.encoder.finish(body)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more})
+
+
+def setup_compression(app) -> None:
+    """COMPRESS_ENABLED 일 때만 등록"""
+    if settings.COMPRESS_ENABLED:
+        app.add_middleware(CompressionMiddleware)
@@ -1,10 +1,13 @@
 # backend/app/database.py
+import logging
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 from sqlmodel import SQLModel, Session, create_engine
-from sqlalchemy import text
+from sqlalchemy import text, func, cast, Integer, inspect, event
+from sqlalchemy.engine import Engine
 
 from .settings import settings, BASE_DIR
 
@@ -26,6 +29,41 @@ else:
 
 engine = create_engine(DATABASE_URL, **engine_kwargs)
 
+
+# ── SQLite 연결별 PRAGMA ─────────────────────────────────────
+# synchronous/cache_size/mmap_size/temp_store/busy_timeout/foreign_keys 는 "연결 단위" 설정
+# → init_db에서 한 번 실행하면 그 연결에만 적용되고, 풀이 나중에 여는 연결은 기본값으로 돔.
+#   connect 이벤트로 새 연결이 만들어질 때마다 같은 프로파일을 적용
+def sqlite_pragmas() -> List[str]:
+    p = [
+        "PRAGMA journal_mode=WAL",  # DB 파일 단위(영구) 설정이지만 반복해도 무해
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}" if settings.SQLITE_SYNCHRONOUS else None,
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}" if settings.SQLITE_CACHE_SIZE else None,
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}" if settings.SQLITE_MMAP_SIZE else None,
+        f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}" if settings.SQLITE_TEMP_STORE else None,
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}" if settings.SQLITE_BUSY_TIMEOUT_MS else None,
+        f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}",
+    ]
+    return [x for x in p if x]
+
+
+def install_sqlite_pragmas(eng: Engine, pragmas: Optional[List[str]] = None) -> None:
+    """eng의 모든 새 DBAPI 연결에 PRAGMA 프로파일 적용 (복제본 등 다른 SQLite 엔진도 사용)"""
+    stmts = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(eng, "connect")
+    def _apply(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            for st in stmts:
+                cur.execute(st)
+        finally:
+            cur.close()
+
+
+if IS_SQLITE:
+    install_sqlite_pragmas(engine)
+
 # SQLite 파일 경로일 경우만, 로컬 프로젝트 내부 폴더 생성
 if IS_SQLITE:
     # urlparse('sqlite:///backend/data/ecy.db').path -> '/backend/data/ecy.db'
@@ -35,17 +73,10 @@ if IS_SQLITE:
 
 
 def init_db() -> None:
-    """앱 시작 시 1회: 테이블/인덱스 생성 (+SQLite만 PRAGMA)"""
+    """앱 시작 시 1회: 테이블/인덱스 생성 (SQLite PRAGMA는 연결마다 connect 이벤트에서 적용)"""
     from . import models  # metadata 등록 중요
     SQLModel.metadata.create_all(engine)
 
-    # SQLite에서만 PRAGMA 적용
-    if IS_SQLITE:
-        with Session(engine) as s:
-            s.exec(text("PRAGMA journal_mode=WAL;"))
-            s.exec(text("PRAGMA synchronous=NORMAL;"))
-            s.commit()
-
     # 인덱스는 양쪽 DB에서 안전 (Postgres/SQLite 둘 다 IF NOT EXISTS 지원)
     with Session(engine) as s:
         s.exec(text(
@@ -56,8 +87,147 @@ def init_db() -> None:
         ))
         s.commit()
 
+    _migrate_change_tracking()
+    _migrate_user_scope()
+    _migrate_queue_event()
+    _seed_version_counters()
+
+
+def _migrate_change_tracking() -> None:
+    """기존 DB에 변경 추적 컬럼(version, updated_at) 추가.
+    create_all은 이미 있는 테이블을 바꾸지 않으므로 없을 때만 ADD COLUMN.
+    기존 행은 version=1 로 채워 ?since=0 전체 조회에 포함되게 함"""
+    ts_type = "DATETIME" if IS_SQLITE else "TIMESTAMP"
+    insp = inspect(engine)
+    with Session(engine) as s:
+        for table in ("worksession", "priorityitem", "resourcelink"):
+            cols = {c["name"] for c in insp.get_columns(table)}
+            if "updated_at" not in cols:
+                s.exec(text(f"ALTER TABLE {table} ADD COLUMN updated_at {ts_type}"))
+            if "version" not in cols:
+                s.exec(text(f"ALTER TABLE {table} ADD COLUMN version INTEGER"))
+                s.exec(text(f"UPDATE {table} SET version = 1"))
+            for col in ("updated_at", "version"):
+                s.exec(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{col} ON {table}({col})"))
+        s.commit()
+
+
+# ── SQLite 통계 유지(PRAGMA optimize / ANALYZE) ─────────────────
+logger = logging.getLogger("ecy.db")
+_maint_stop = threading.Event()
+_maint_thread: Optional[threading.Thread] = None
+
+
+def sqlite_optimize(eng: Engine = engine) -> None:
+    """플래너 통계 갱신. 통계 테이블이 아예 없으면 ANALYZE 한 번, 이후엔 가벼운 PRAGMA optimize"""
+    with eng.connect() as conn:
+        has_stats = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).first()
+        conn.exec_driver_sql("PRAGMA optimize" if has_stats else "ANALYZE")
+        conn.commit()
+
+
+def start_sqlite_maintenance() -> None:
+    """기동 시 1회 + SQLITE_OPTIMIZE_SEC 주기로 optimize (SQLite가 아니면 아무것도 안 함)"""
+    global _maint_thread
+    if not IS_SQLITE:
+        return
+    sqlite_optimize()
+    interval = settings.SQLITE_OPTIMIZE_SEC
+    if interval <= 0 or (_maint_thread and _maint_thread.is_alive()):
+        return
+
+    def _run():
+        while not _maint_stop.wait(interval):
+            try:
+                sqlite_optimize()
+            except Exception:
+                logger.exception("PRAGMA optimize failed")
+
+    _maint_stop.clear()
+    _maint_thread = threading.Thread(target=_run, name="sqlite-optimize", daemon=True)
+    _maint_thread.start()
+
+
+def stop_sqlite_maintenance() -> None:
+    _maint_stop.set()
+    if _maint_thread:
+        _maint_thread.join(5.0)
+
+
+def elapsed_minutes_expr(end, start):
+    """(end - start) 분(내림)을 DB 안에서 계산하는 SQL 식.
+    UPDATE ... RETURNING 한 번으로 종료시각과 minutes를 같이 쓰기 위해 사용"""
+    if IS_SQLITE:
+        # julianday 차이는 부동소수 → 초 단위(ms 반올림)로 바꾼 뒤 분으로 내림
+        secs = func.round((func.julianday(end) - func.julianday(start)) * 86400, 3)
+        return cast(secs / 60, Integer)
+    return cast(func.floor(func.extract("epoch", end - start) / 60), Integer)
+
+
+def _migrate_user_scope() -> None:
+    """기존 DB에 user_id 컬럼 + 사용자별 복합/부분 인덱스 추가.
+    기존 행은 DEFAULT_USER_ID 소유로 채움"""
+    insp = inspect(engine)
+    default_user = settings.DEFAULT_USER_ID.replace("'", "''")
+    with Session(engine) as s:
+        for table in ("worksession", "priorityitem"):
+            cols = {c["name"] for c in insp.get_columns(table)}
+            if "user_id" not in cols:
+                s.exec(text(
+                    f"ALTER TABLE {table} ADD COLUMN user_id VARCHAR NOT NULL DEFAULT '{default_user}'"
+                ))
+        if "user_id" not in {c["name"] for c in insp.get_columns("tombstone")}:
+            s.exec(text("ALTER TABLE tombstone ADD COLUMN user_id VARCHAR"))
+        s.exec(text(
+            "CREATE INDEX IF NOT EXISTS ix_worksession_user_started ON worksession(user_id, started_at)"
+        ))
+        s.exec(text(
+            "CREATE INDEX IF NOT EXISTS ix_worksession_user_version ON worksession(user_id, version)"
+        ))
+        s.exec(text(
+            "CREATE INDEX IF NOT EXISTS ix_priorityitem_user_due "
+            "ON priorityitem(user_id, due_weekday, due_hour, due_minute)"
+        ))
+        s.exec(text(
+            "CREATE INDEX IF NOT EXISTS ix_priorityitem_user_version ON priorityitem(user_id, version)"
+        ))
+        s.commit()
+        try:
+            s.exec(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ux_worksession_user_active "
+                "ON worksession(user_id) WHERE ended_at IS NULL"
+            ))
+            s.commit()
+        except Exception:
+            # 이미 한 사용자에 활성 세션이 여러 개면 생성 불가 → 정리 후 재기동 필요
+            s.rollback()
+            logger.warning("ux_worksession_user_active not created: multiple active sessions exist")
+
+
+def _migrate_queue_event() -> None:
+    """기존 DB에 write-behind 큐 이벤트 id 컬럼 + 유니크 인덱스 추가"""
+    with Session(engine) as s:
+        if "queue_event" not in {c["name"] for c in inspect(engine).get_columns("worksession")}:
+            s.exec(text("ALTER TABLE worksession ADD COLUMN queue_event VARCHAR"))
+        s.exec(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_worksession_queue_event ON worksession(queue_event)"
+        ))
+        s.commit()
+
+
+def _seed_version_counters() -> None:
+    """version 카운터 행 준비: 기존 DB는 현재 최대 version 에서 이어서 번호를 매김"""
+    from .models import seed_version_counter
+    with engine.begin() as conn:
+        for table in ("worksession", "priorityitem", "resourcelink"):
+            seed_version_counter(conn, table)
+
 
 def get_session():
-    """요청 단위 세션"""
-    with Session(engine) as session:
+    """요청 단위 세션
+    expire_on_commit=False: 쓰기는 RETURNING으로 최신 값을 이미 받아오므로
+    commit 후 속성 접근 시 재조회(SELECT)가 나가지 않게 함"""
+    with Session(engine, expire_on_commit=False) as session:
         yield session
@@ -1,5 +1,7 @@
+import hmac
+import re
 from typing import Optional
-from fastapi import Header, HTTPException, Depends
+from fastapi import Header, HTTPException, Depends, Query
 from .settings import settings
 from .database import get_session
 
@@ -8,5 +10,38 @@ def admin_guard(x_admin_code: Optional[str] = Header(default=None)):
         raise HTTPException(401, "관리자 코드가 필요합니다.")
     return True
 
+_USER_RE = re.compile(r"^[A-Za-z0-9_.@-]{1,64}$")
+
+def _token_user(token: str) -> Optional[str]:
+    # 길이/내용과 무관하게 모든 토큰과 상수 시간 비교
+    found = None
+    for tok, uid in settings.USER_TOKENS.items():
+        if hmac.compare_digest(tok.encode(), token.encode()):
+            found = uid
+    return found
+
+def current_user(
+    authorization: Optional[str] = Header(default=None),
+    x_user_id: Optional[str] = Header(default=None),
+    x_admin_code: Optional[str] = Header(default=None),
+    token: Optional[str] = Query(default=None, include_in_schema=False),
+) -> str:
+    """요청 사용자 id
+    - USER_TOKENS 미설정(1인 배포): 항상 DEFAULT_USER_ID
+    - 설정 시: Authorization: Bearer <토큰> (EventSource 처럼 헤더를 못 붙이면 ?token=) → 토큰에 매핑된 사용자
+    - 관리자(ADMIN_CODE 일치)는 X-User-Id 로 대상 사용자를 지정 가능"""
+    if x_user_id and settings.ADMIN_CODE and x_admin_code == settings.ADMIN_CODE:
+        if not _USER_RE.match(x_user_id):
+            raise HTTPException(400, "잘못된 사용자 id 입니다.")
+        return x_user_id
+    if not settings.USER_TOKENS:
+        return settings.DEFAULT_USER_ID
+    if authorization and authorization[:7].lower() == "bearer ":
+        token = authorization[7:].strip()
+    user_id = _token_user(token) if token else None
+    if user_id is None:
+        raise HTTPException(401, "사용자 토큰이 필요합니다.", headers={"WWW-Authenticate": "Bearer"})
+    return user_id
+
 # 세션 DI 재노출(가독성용)
 DbSession = get_session
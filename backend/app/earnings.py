@@ -0,0 +1,219 @@
+# backend/app/earnings.py
+# 급여 계산
+#  - 세션을 KST 기준 경계(자정, 야간 시작/끝)에서 잘라 구간별로 시급 × 배율 적용
+#  - 시급은 effective_from 기준 최신 값(사용자 전용 시급이 있으면 우선)
+#  - 월 결과는 MonthlyEarning 테이블에 data_key(세션 MAX(version)/건수 + 설정 해시)와 함께 저장
+#    → 데이터가 그대로인 달은 재계산 없이 저장값 사용
+#  - 1년 조회도 달별 키(GROUP BY 한 번), 저장값, 바뀐 달 세션을 각각 한 번에 읽고 한 번 커밋
+#  - 세션은 시작 시각이 속한 달로 집계(monthly_summary와 같은 기준). 진행 중 세션은 제외
+import hashlib
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from .database import IS_SQLITE
+from .models import WorkSession, MonthlyEarning
+from .sessions import now_kst_native
+from .settings import settings, PayRate
+
+
+@dataclass
+class SessionPay:
+    id: Optional[int]
+    started_at: datetime
+    ended_at: datetime
+    minutes: int
+    night_minutes: int
+    weekend_minutes: int
+    pay: int
+
+
+class RateTable:
+    """사용자별 (effective_from, hourly) 정렬 목록 → 날짜로 이진 탐색"""
+
+    def __init__(self, rates: Sequence[PayRate], user_id: str):
+        own = [r for r in rates if r.user_id == user_id]
+        chosen = own or [r for r in rates if r.user_id is None]
+        chosen = sorted(chosen, key=lambda r: r.effective_from)
+        self._dates = [r.effective_from for r in chosen]
+        self._hourly = [r.hourly for r in chosen]
+
+    def hourly_on(self, d: date) -> int:
+        i = bisect_right(self._dates, d) - 1
+        return self._hourly[i] if i >= 0 else 0  # 적용 시작 전이면 0원
+
+
+def config_hash() -> str:
+    cfg = {
+        "rates": [r.model_dump(mode="json") for r in settings.PAY_RATES],
+        "night": settings.PAY_NIGHT_MULTIPLIER,
+        "weekend": settings.PAY_WEEKEND_MULTIPLIER,
+        "night_hours": [settings.PAY_NIGHT_START_HOUR, settings.PAY_NIGHT_END_HOUR],
+    }
+    return hashlib.sha1(json.dumps(cfg, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _is_night(hour: int) -> bool:
+    start, end = settings.PAY_NIGHT_START_HOUR, settings.PAY_NIGHT_END_HOUR
+    if start == end:
+        return False
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end  # 22~06 처럼 자정을 넘는 구간
+
+
+def _cut_points(start: datetime, end: datetime) -> List[datetime]:
+    """(start, end) 사이의 분류 경계: 매일 00:00 / 야간 시작 / 야간 끝"""
+    hours = sorted({0, settings.PAY_NIGHT_START_HOUR % 24, settings.PAY_NIGHT_END_HOUR % 24})
+    pts = []
+    d = start.date()
+    while d <= end.date():
+        for h in hours:
+            t = datetime(d.year, d.month, d.day, h)
+            if start < t < end:
+                pts.append(t)
+        d += timedelta(days=1)
+    return pts
+
+
+def session_pay(ws: WorkSession, rates: RateTable) -> SessionPay:
+    night_m = Decimal(settings.PAY_NIGHT_MULTIPLIER) - 1
+    weekend_m = Decimal(settings.PAY_WEEKEND_MULTIPLIER) - 1
+
+    edges = [ws.started_at, *_cut_points(ws.started_at, ws.ended_at), ws.ended_at]
+    pay = Decimal(0)
+    night_s = weekend_s = 0.0
+    for a, b in zip(edges, edges[1:]):
+        secs = (b - a).total_seconds()
+        night = _is_night(a.hour)
+        weekend = a.weekday() >= 5
+        mult = 1 + (night_m if night else 0) + (weekend_m if weekend else 0)
+        pay += Decimal(secs) / 3600 * rates.hourly_on(a.date()) * mult
+        night_s += secs if night else 0
+        weekend_s += secs if weekend else 0
+
+    return SessionPay(
+        id=ws.id,
+        started_at=ws.started_at,
+        ended_at=ws.ended_at,
+        minutes=ws.minutes if ws.minutes is not None else int((ws.ended_at - ws.started_at).total_seconds() // 60),
+        night_minutes=int(night_s // 60),
+        weekend_minutes=int(weekend_s // 60),
+        pay=int(pay.quantize(Decimal(1), rounding=ROUND_HALF_UP)),
+    )
+
+
+def _month_range(year: int, month: int) -> Tuple[datetime, datetime]:
+    ny, nm = (year + 1, 1) if month == 12 else (year, month + 1)
+    return datetime(year, month, 1), datetime(ny, nm, 1)
+
+
+def _totals(per_session: Sequence[SessionPay]) -> Dict[str, int]:
+    return {
+        "sessions": len(per_session),
+        "minutes": sum(p.minutes for p in per_session),
+        "night_minutes": sum(p.night_minutes for p in per_session),
+        "weekend_minutes": sum(p.weekend_minutes for p in per_session),
+        "pay": sum(p.pay for p in per_session),
+    }
+
+
+@dataclass
+class MonthEarning:
+    month: int
+    earning: MonthlyEarning
+    cached: bool
+    items: Optional[List[SessionPay]] = None  # detail 요청 시 세션별 내역
+
+
+def _upsert(session: Session, rows: List[dict]) -> None:
+    """(user_id, year, month) 유니크 기준 upsert → 같은 달을 동시에 처음 계산해도 충돌 없이 마지막 값이 남음"""
+    insert = sqlite_insert if IS_SQLITE else pg_insert
+    stmt = insert(MonthlyEarning)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "year", "month"],
+            set_={c: stmt.excluded[c] for c in rows[0] if c not in ("user_id", "year", "month")},
+        ),
+        rows,
+    )
+
+
+def earnings_for(
+    session: Session, user_id: str, year: int, months: Sequence[int], detail: bool = False,
+) -> List[MonthEarning]:
+    """요청한 달들의 급여. 달 수와 무관하게 쿼리 최대 3번 + 커밋 1번
+    1) 달별 MAX(version)/COUNT (GROUP BY)  2) 저장된 MonthlyEarning  3) 다시 계산할 달의 세션(한 범위)"""
+    months = sorted(set(months))
+    lo, _ = _month_range(year, months[0])
+    _, hi = _month_range(year, months[-1])
+    in_range = (
+        WorkSession.user_id == user_id,
+        WorkSession.started_at >= lo,
+        WorkSession.started_at < hi,
+        WorkSession.ended_at.is_not(None),
+    )
+    month_of = func.extract("month", WorkSession.started_at)
+
+    # 달별 데이터 버전: 수정/추가는 MAX(version), 삭제는 COUNT 로 감지
+    cfg = config_hash()
+    keys = {m: f"0:0:{cfg}" for m in months}
+    for m, max_v, cnt in session.exec(
+        select(month_of, func.coalesce(func.max(WorkSession.version), 0), func.count())
+        .where(*in_range).group_by(month_of)
+    ):
+        if int(m) in keys:
+            keys[int(m)] = f"{max_v}:{cnt}:{cfg}"
+
+    saved = {
+        e.month: e for e in session.exec(
+            select(MonthlyEarning).where(
+                MonthlyEarning.user_id == user_id,
+                MonthlyEarning.year == year,
+                MonthlyEarning.month.in_(months),
+            )
+        )
+    }
+    stale = [m for m in months if m not in saved or saved[m].data_key != keys[m]]
+    load = set(months) if detail else set(stale)
+
+    per_month: Dict[int, List[SessionPay]] = {m: [] for m in load}
+    if load:
+        lo, _ = _month_range(year, min(load))
+        _, hi = _month_range(year, max(load))
+        rates = RateTable(settings.PAY_RATES, user_id)
+        for ws in session.exec(
+            select(WorkSession).where(*in_range, WorkSession.started_at >= lo, WorkSession.started_at < hi)
+            .order_by(WorkSession.started_at)
+        ):
+            if ws.started_at.month in per_month:
+                per_month[ws.started_at.month].append(session_pay(ws, rates))
+
+    now = now_kst_native()  # 다른 시각 컬럼과 같은 KST naive
+    fresh = {
+        m: MonthlyEarning(
+            user_id=user_id, year=year, month=m, data_key=keys[m], computed_at=now, **_totals(per_month[m]),
+        )
+        for m in stale
+    }
+    if fresh:
+        _upsert(session, [e.model_dump(exclude={"id"}) for e in fresh.values()])
+        session.commit()
+
+    return [
+        MonthEarning(
+            month=m,
+            earning=fresh.get(m) or saved[m],
+            cached=m not in fresh,
+            items=per_month[m] if detail else None,
+        )
+        for m in months
+    ]
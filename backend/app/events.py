@@ -0,0 +1,98 @@
+# backend/app/events.py
+# 프로세스 내 pub/sub 허브 (SSE 푸시용)
+#  - 쓰기 핸들러(스레드풀)에서 publish() → 구독자별 asyncio.Queue 로 전달
+#  - 구독자는 /events 스트림 하나만 열어두고, 이벤트를 받으면 ?since= 로 변경분만 가져감
+#  - 느린 구독자는 큐가 차면 끊음 → EventSource가 자동 재연결 후 다시 맞춤
+#  - 사용자 소유 이벤트(user_id 포함)는 그 사용자 구독자에게만, 공용(링크 등)은 모두에게
+#  - 워커 프로세스가 여러 개면 각 워커 안에서만 전파됨
+import asyncio
+import itertools
+import json
+import threading
+from typing import Any, Optional, Set
+
+CLOSED = object()  # 구독 종료 신호
+
+
+class Subscriber:
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, topics: Optional[Set[str]], user_id: Optional[str], maxsize: int,
+    ):
+        self.loop = loop
+        self.topics = topics
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def wants(self, topic: str, user_id: Optional[str]) -> bool:
+        if user_id is not None and user_id != self.user_id:
+            return False
+        return self.topics is None or topic in self.topics
+
+    def _offer(self, item) -> None:
+        # 이벤트 루프 스레드에서만 실행됨
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # 밀린 구독자: 비우고 종료 신호만 남김
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(CLOSED)
+
+
+class EventHub:
+    def __init__(self, maxsize: int = 100):
+        self._subs: Set[Subscriber] = set()
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._maxsize = maxsize
+
+    def subscribe(self, topics: Optional[Set[str]] = None, user_id: Optional[str] = None) -> Subscriber:
+        """이벤트 루프 안(async 엔드포인트)에서 호출"""
+        sub = Subscriber(asyncio.get_running_loop(), topics, user_id, self._maxsize)
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    def publish(self, topic: str, action: str, **data: Any) -> None:
+        """어느 스레드에서든 호출 가능. 구독자가 없으면 아무 일도 안 함"""
+        with self._lock:
+            subs = [s for s in self._subs if s.wants(topic, data.get("user_id"))]
+        if not subs:
+            return
+        msg = (next(self._seq), topic, {"action": action, **data})
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._offer, msg)
+            except RuntimeError:  # 루프가 이미 닫힘
+                self.unsubscribe(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+
+def format_sse(seq: int, topic: str, data: dict) -> str:
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"id: {seq}\nevent: {topic}\ndata: {payload}\n\n"
+
+
+hub = EventHub()
+
+
+def publish(topic: str, action: str, **data: Any) -> None:
+    hub.publish(topic, action, **data)
+
+
+def publish_row(topic: str, action: str, row) -> None:
+    """쓰기 핸들러용 단축: id/version만 실어 보냄(본문은 ?since= 로 조회)"""
+    publish(
+        topic, action,
+        id=getattr(row, "id", None),
+        version=getattr(row, "version", None),
+        user_id=getattr(row, "user_id", None),
+    )
@@ -0,0 +1,140 @@
+# backend/app/export.py
+# 세션 컬럼형 내보내기 (Parquet / Arrow IPC)
+#  - (user_id, version) 인덱스로 version 순 keyset 페이지 조회 → 페이지 하나 = RecordBatch 하나 = row group 하나
+#  - 시작/종료/수정 시각은 timestamp[ms] 타입(KST naive 그대로, 시간대 없음. Parquet는 초 단위를 지원하지 않아 ms)
+#  - 증분: since(version) 이후 생기거나 바뀐 종료 세션만. 같은 id가 여러 번 나오면 version 큰 쪽이 최신
+#    (삭제는 포함되지 않음 → 필요하면 /timer/changes 의 deleted 사용)
+#  - 내보내기 시작 시점의 MAX(version)까지만 읽어서 결과 범위가 고정됨 → 다음 증분의 since 로 사용
+import io
+from typing import Iterator, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import func, tuple_
+from sqlmodel import Session, select
+
+from .models import WorkSession
+
+SCHEMA = pa.schema([
+    pa.field("id", pa.int64(), nullable=False),
+    pa.field("user_id", pa.string(), nullable=False),
+    pa.field("started_at", pa.timestamp("ms"), nullable=False),
+    pa.field("ended_at", pa.timestamp("ms"), nullable=False),
+    pa.field("minutes", pa.int32()),
+    pa.field("memo", pa.string()),
+    pa.field("version", pa.int64()),
+    pa.field("updated_at", pa.timestamp("ms")),
+])
+
+_COLUMNS = [WorkSession.__table__.c[f.name] for f in SCHEMA]
+
+
+def snapshot_version(session: Session, user_id: Optional[str] = None) -> int:
+    q = select(func.coalesce(func.max(WorkSession.version), 0))
+    if user_id is not None:
+        q = q.where(WorkSession.user_id == user_id)
+    return session.exec(q).one()
+
+
+def iter_batches(
+    session: Session, user_id: Optional[str], since: int, upto: int, batch_size: int = 10_000,
+) -> Iterator[pa.RecordBatch]:
+    """version ∈ (since, upto] 인 종료 세션을 batch_size 행씩. ORM 객체 없이 튜플 → 컬럼 변환
+    version 은 유일하지 않으므로(마이그레이션된 행, 여러 행을 바꾼 UPDATE) (version, id) 쌍으로 페이지"""
+    cursor: Optional[Tuple[int, int]] = None
+    v_idx, id_idx = SCHEMA.get_field_index("version"), SCHEMA.get_field_index("id")
+    while True:
+        q = (
+            select(*_COLUMNS)
+            .where(WorkSession.version > since, WorkSession.version <= upto, WorkSession.ended_at.is_not(None))
+            .order_by(WorkSession.version, WorkSession.id)
+            .limit(batch_size)
+        )
+        if cursor is not None:
+            q = q.where(tuple_(WorkSession.version, WorkSession.id) > cursor)
+        if user_id is not None:
+            q = q.where(WorkSession.user_id == user_id)
+        rows = session.exec(q).all()
+        if not rows:
+            return
+        cols = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(c, type=f.type) for c, f in zip(cols, SCHEMA)], schema=SCHEMA,
+        )
+        if len(rows) < batch_size:
+            return
+        cursor = (rows[-1][v_idx], rows[-1][id_idx])
+
+
+def write_parquet(batches, sink, compression: str = "zstd") -> int:
+    """batch마다 row group 하나. 쓴 행 수 반환"""
+    n = 0
+    with pq.ParquetWriter(sink, SCHEMA, compression=compression) as w:
+        for b in batches:
+            w.write_batch(b)
+            n += b.num_rows
+    return n
+
+
+def write_arrow(batches, sink) -> int:
+    n = 0
+    with pa.ipc.new_stream(sink, SCHEMA) as w:
+        for b in batches:
+            w.write_batch(b)
+            n += b.num_rows
+    return n
+
+
+class _ChunkSink(io.RawIOBase):
+    """writer가 쓴 바이트를 모아뒀다가 꺼내 가는 출력(스트리밍 응답용)"""
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._buf += b
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def take(self) -> bytes:
+        out = bytes(self._buf)
+        self._buf.clear()
+        return out
+
+
+def stream_parquet(batches, compression: str = "zstd") -> Iterator[bytes]:
+    """row group 단위로 바로 내보냄 → 전체 파일을 메모리에 만들지 않음 (footer는 마지막 조각)"""
+    sink = _ChunkSink()
+    w = pq.ParquetWriter(sink, SCHEMA, compression=compression)
+    try:
+        for b in batches:
+            w.write_batch(b)
+            chunk = sink.take()
+            if chunk:
+                yield chunk
+    finally:
+        w.close()
+    yield sink.take()
+
+
+def stream_arrow(batches) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    w = pa.ipc.new_stream(sink, SCHEMA)
+    for b in batches:
+        w.write_batch(b)
+        yield sink.take()
+    w.close()
+    yield sink.take()
+
+
+def export_range(session: Session, user_id: Optional[str], since: int) -> Tuple[int, Iterator[pa.RecordBatch]]:
+    """(이번 내보내기의 상한 version, batch 이터레이터)"""
+    upto = snapshot_version(session, user_id)
+    return upto, iter_batches(session, user_id, since, upto)
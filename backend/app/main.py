@@ -6,9 +6,13 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
 from .settings import settings
-from .database import init_db
-from .routers import priority, links, timer
+from .database import init_db, engine, start_sqlite_maintenance, stop_sqlite_maintenance
+from .routers import priority, links, timer, events
 from .admin import setup_admin
+from .querylog import setup_query_log
+from .compression import setup_compression
+from .timer_queue import get_timer_queue
+from .replica import prepare_replica, start_replica_sync, stop_replica_sync
 
 
 # 디버그
@@ -34,15 +38,43 @@ if settings.CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# 느린 쿼리/중복 쿼리 진단 (SLOW_QUERY_MS / QUERY_DUP_WARN 설정 시에만)
+setup_query_log(app, engine)
+
+# 응답 압축 (COMPRESS_* 설정)
+setup_compression(app)
+
 @app.on_event("startup")
 def on_start():
-    init_db()
+    # 멀티 워커(python -m app.serve)에서는 스키마/복제본 준비는 마스터가 fork 전에 한 번,
+    # 백그라운드 작업(큐 반영, 복제본 동기화, SQLite optimize)은 워커 하나에서만
+    if settings.WEB_INIT_DB:
+        init_db()
+        prepare_replica()
     setup_admin(app)
+    if settings.WEB_BACKGROUND_JOBS:
+        start_sqlite_maintenance()
+        start_replica_sync()
+        queue = get_timer_queue()
+        if queue is not None:
+            queue.start_background(engine)
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if settings.WEB_BACKGROUND_JOBS:
+        queue = get_timer_queue()
+        if queue is not None:
+            queue.shutdown(engine)
+    stop_replica_sync()
+    stop_sqlite_maintenance()
+    # 백그라운드 작업이 모두 끝난 뒤 풀 정리 (Neon 쪽 연결을 즉시 반환)
+    engine.dispose()
 
 # API 라우터
 app.include_router(timer.router)
 app.include_router(priority.router)
 app.include_router(links.router)
+app.include_router(events.router)
 
 
 # ── 정적 서빙 + SPA fallback ──────────────────────────────────
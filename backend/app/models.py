@@ -1,18 +1,89 @@
 from typing import Optional, List, Dict
 from datetime import datetime, date
+from zoneinfo import ZoneInfo
 from sqlmodel import SQLModel, Field, Column, JSON
+from sqlalchemy import Index, text
+
+from .settings import settings
+
+_KST = ZoneInfo("Asia/Seoul")
+
+
+# ---- 변경 추적 공통 ------------------------------------------------------
+# version: 테이블 단위 단조 증가 번호. 행 쓰기와 삭제 기록(Tombstone)이 같은 번호 공간을 공유
+#          → 클라이언트는 마지막으로 본 version 하나만 들고 ?since= 로 변경분만 받음
+# 번호는 테이블별 카운터 행(version_counter)에서 UPDATE ... RETURNING 으로 받음
+#  - 카운터 행 잠금이 커밋까지 유지되므로 같은 테이블 쓰기는 번호 순서대로 커밋됨
+#    (MAX(version)+1 방식은 동시 쓰기에서 같은 번호/커밋 순서 역전이 생겨 ?since= 커서가 행을 놓침)
+#  - 컬럼 기본값/갱신값(컨텍스트 함수)이라 ORM/Core/sqladmin 쓰기 모두 자동 적용
+_BUMP_VERSION = text("UPDATE version_counter SET v = v + 1 WHERE table_name = :t RETURNING v")
+
+
+def seed_version_counter(conn, table: str) -> None:
+    """카운터 행이 없으면 기존 행/삭제 기록의 최대 version 으로 생성 (있으면 그대로)"""
+    conn.execute(text(
+        "INSERT INTO version_counter (table_name, v) "
+        "SELECT :t, COALESCE(MAX(v), 0) FROM ("
+        f"SELECT MAX(version) AS v FROM {table} "
+        "UNION ALL SELECT MAX(version) FROM tombstone WHERE table_name = :t"
+        ") AS vv WHERE true ON CONFLICT (table_name) DO NOTHING"  # WHERE: SQLite upsert 구문 모호성 회피
+    ), {"t": table})
+
+
+def next_version(conn, table: str) -> int:
+    """table 의 다음 version 할당 (호출한 트랜잭션이 끝날 때까지 카운터 행 잠금)"""
+    v = conn.execute(_BUMP_VERSION, {"t": table}).scalar()
+    if v is None:
+        seed_version_counter(conn, table)
+        v = conn.execute(_BUMP_VERSION, {"t": table}).scalar_one()
+    return v
+
+def _now_kst() -> datetime:
+    return datetime.now(_KST).replace(tzinfo=None)  # DB는 KST naive 저장
+
+def _version_field(table: str):
+    def _default(context):
+        return next_version(context.connection, table)
+    return Field(default=None, index=True, sa_column_kwargs={"default": _default, "onupdate": _default})
+
+def _updated_at_field():
+    return Field(default=None, index=True, sa_column_kwargs={"default": _now_kst, "onupdate": _now_kst})
+
 
 # 근무 세션(타이머)
 class WorkSession(SQLModel, table=True):
+    __table_args__ = (
+        # 사용자별 월 조회/합계: (user_id, started_at) 범위 스캔
+        Index("ix_worksession_user_started", "user_id", "started_at"),
+        Index("ix_worksession_user_version", "user_id", "version"),
+        # 사용자당 활성 세션은 하나 — 부분 유니크 인덱스로 DB가 직접 보장
+        Index(
+            "ux_worksession_user_active", "user_id", unique=True,
+            sqlite_where=text("ended_at IS NULL"), postgresql_where=text("ended_at IS NULL"),
+        ),
+        # write-behind 큐 이벤트는 한 번만 반영 (재시도/재기동 시 중복 세션 방지)
+        Index("ux_worksession_queue_event", "queue_event", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str = Field(default=settings.DEFAULT_USER_ID)
     started_at: datetime = Field(index=True)            # ← 인덱스
     ended_at: Optional[datetime] = Field(default=None, index=True)  # ← 선택
     minutes: Optional[int] = None
     memo: Optional[str] = None
+    queue_event: Optional[str] = None  # write-behind 큐 시작 이벤트 id (직접 쓰기는 NULL)
+    updated_at: Optional[datetime] = _updated_at_field()
+    version: Optional[int] = _version_field("worksession")
 
 # 채점 우선순위 항목
 class PriorityItem(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_priorityitem_user_due", "user_id", "due_weekday", "due_hour", "due_minute"),
+        Index("ix_priorityitem_user_version", "user_id", "version"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str = Field(default=settings.DEFAULT_USER_ID)
 
     # 필수
     book: str = Field(index=True)
@@ -28,9 +99,48 @@ class PriorityItem(SQLModel, table=True):
     # 완료 상태(주당 1회 완료 판정용) — 대안 A: 주 시작일 보관
     completed_week_start: Optional[date] = Field(default=None, index=True)
 
+    updated_at: Optional[datetime] = _updated_at_field()
+    version: Optional[int] = _version_field("priorityitem")
+
 # 링크 모음
 class ResourceLink(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     url: str
     category: Optional[str] = None
+    updated_at: Optional[datetime] = _updated_at_field()
+    version: Optional[int] = _version_field("resourcelink")
+
+# 월별 급여 계산 결과 캐시 (earnings). data_key가 같으면 재계산 없이 그대로 사용
+class MonthlyEarning(SQLModel, table=True):
+    __table_args__ = (Index("ux_monthlyearning_user_month", "user_id", "year", "month", unique=True),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str
+    year: int
+    month: int
+    data_key: str          # 세션 데이터 버전 + 시급 설정 해시
+    sessions: int
+    minutes: int
+    night_minutes: int
+    weekend_minutes: int
+    pay: int               # 원
+    computed_at: datetime = Field(default_factory=_now_kst)
+
+# 테이블별 version 카운터 (next_version)
+class VersionCounter(SQLModel, table=True):
+    __tablename__ = "version_counter"
+
+    table_name: str = Field(primary_key=True)
+    v: int = 0
+
+# 삭제 기록 (delta 동기화용). version은 원본 테이블과 같은 번호 공간
+class Tombstone(SQLModel, table=True):
+    __table_args__ = (Index("ix_tombstone_table_version", "table_name", "version"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    table_name: str
+    row_id: int
+    user_id: Optional[str] = None  # 사용자별 테이블이면 소유자(링크는 None)
+    version: int
+    deleted_at: datetime = Field(default_factory=_now_kst)
@@ -0,0 +1,160 @@
+# backend/app/overlap.py
+# 세션 시간 겹침 검사/정리
+#  - 사용자 세션이 서로 겹치지 않는다는 불변식을 유지 → 시작순 정렬 시 종료도 정렬됨
+#    ⇒ 새 구간 [s, e) 와 겹칠 수 있는 후보는 "시작이 e 보다 앞선 것 중 가장 늦은 세션" 하나뿐
+#  - DB: (user_id, started_at) 인덱스로 후보 1건만 조회 (LIMIT 1, O(log n))
+#  - 메모리: IntervalIndex (정렬 리스트 + 이진 탐색) → 대량 import 시 행마다 DB 조회 없이 검사
+#  - 이미 겹친 과거 데이터는 merge_overlaps 로 한 번의 정렬 순회에서 병합
+#  - 불변식은 모든 ORM 쓰기(sqladmin 편집 등)에서도 mapper 이벤트로 검사 → 겹치면 OverlapError
+#    (라우터의 Core UPDATE 는 find_overlap 으로 직접 검사)
+from bisect import bisect_left
+from datetime import datetime
+from math import floor
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, inspect, update
+from sqlmodel import Session, select
+
+from .models import WorkSession
+from .changes import record_tombstone
+
+
+class OverlapError(ValueError):
+    pass
+
+
+def _candidate(q, user_id: str, end: Optional[datetime], exclude_id: Optional[int]):
+    """시작이 end 보다 앞선 것 중 가장 늦은 세션 1건 (end 가 None 이면 열린 구간 → 가장 늦은 세션)"""
+    q = q.where(WorkSession.user_id == user_id)
+    if end is not None:
+        q = q.where(WorkSession.started_at < end)
+    if exclude_id is not None:
+        q = q.where(WorkSession.id != exclude_id)
+    return q.order_by(WorkSession.started_at.desc()).limit(1)
+
+
+def _overlaps(cand_end: Optional[datetime], start: datetime) -> bool:
+    return cand_end is None or cand_end > start
+
+
+def find_overlap(
+    session: Session, user_id: str, start: datetime, end: Optional[datetime], exclude_id: Optional[int] = None,
+) -> Optional[WorkSession]:
+    """[start, end) 와 겹치는 세션(있으면 하나). 경계가 맞닿는 것(끝 == 시작)은 겹침 아님.
+    진행 중 세션(ended_at NULL)은 끝이 열린 구간으로 취급"""
+    cand = session.exec(_candidate(select(WorkSession), user_id, end, exclude_id)).first()
+    if cand is not None and _overlaps(cand.ended_at, start):
+        return cand
+    return None
+
+
+_INTERVAL_ATTRS = ("user_id", "started_at", "ended_at")
+
+
+def _check_orm_write(mapper, connection, target: WorkSession) -> None:
+    if target.id is not None:
+        state = inspect(target)
+        if not any(state.attrs[a].history.has_changes() for a in _INTERVAL_ATTRS):
+            return  # 메모만 바꾸는 경우 등은 검사 생략
+    if target.ended_at is not None and target.ended_at <= target.started_at:
+        raise OverlapError("종료가 시작보다 빠를 수 없습니다.")
+    row = connection.execute(
+        _candidate(select(WorkSession.id, WorkSession.ended_at), target.user_id, target.ended_at, target.id)
+    ).first()
+    if row is not None and _overlaps(row.ended_at, target.started_at):
+        raise OverlapError(f"다른 세션(#{row.id})과 시간이 겹칩니다.")
+
+
+event.listen(WorkSession, "before_insert", _check_orm_write)
+event.listen(WorkSession, "before_update", _check_orm_write)
+
+
+class IntervalIndex:
+    """서로 겹치지 않는 [start, end) 구간 집합. 검사 O(log n), 추가는 정렬 위치에 삽입"""
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime]] = ()):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        for s, e in sorted(intervals):
+            self.add(s, e)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def conflict(self, start: datetime, end: datetime) -> Optional[Tuple[datetime, datetime]]:
+        i = bisect_left(self._starts, end) - 1  # 시작 < end 인 것 중 마지막
+        if i >= 0 and self._ends[i] > start:
+            return self._starts[i], self._ends[i]
+        return None
+
+    def add(self, start: datetime, end: datetime) -> bool:
+        """겹치지 않으면 추가하고 True, 겹치면 추가하지 않고 False"""
+        if self.conflict(start, end):
+            return False
+        i = bisect_left(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        return True
+
+
+def load_index(session: Session, user_id: str) -> IntervalIndex:
+    """사용자의 기존 종료 세션으로 인덱스 구성 (진행 중 세션은 지금까지로 보지 않고 제외)"""
+    rows = session.exec(
+        select(WorkSession.started_at, WorkSession.ended_at)
+        .where(WorkSession.user_id == user_id, WorkSession.ended_at.is_not(None))
+        .order_by(WorkSession.started_at)
+    ).all()
+    idx = IntervalIndex()
+    for s, e in rows:
+        # 기존 데이터가 이미 겹쳐 있으면 앞선 구간만 남김 (merge_overlaps 로 정리 권장)
+        idx.add(s, e)
+    return idx
+
+
+# ── 병합 ────────────────────────────────────────────────────
+def _flush_group(session: Session, group: List[WorkSession], end: datetime, dry_run: bool) -> None:
+    keep, drop = group[0], group[1:]
+    memos = [g.memo for g in group if g.memo]
+    memo = " / ".join(dict.fromkeys(memos)) or None
+    if not dry_run:
+        for g in drop:
+            record_tombstone(session, WorkSession, g.id, g.user_id)
+        session.execute(delete(WorkSession).where(WorkSession.id.in_([g.id for g in drop])))
+        session.execute(
+            update(WorkSession)
+            .where(WorkSession.id == keep.id)
+            .values(ended_at=end, memo=memo, minutes=floor((end - keep.started_at).total_seconds() / 60))
+        )
+
+
+def merge_overlaps(
+    session: Session, user_id: Optional[str] = None, dry_run: bool = False, batch: int = 1000,
+) -> List[Tuple[str, List[int], datetime, datetime]]:
+    """(user_id, started_at) 순으로 한 번 훑으며 겹치는 종료 세션들을 가장 이른 세션 하나로 합침.
+    합쳐진 그룹 목록 [(user_id, [ids], 시작, 끝)] 반환. 커밋은 호출 측"""
+    q = select(WorkSession).where(WorkSession.ended_at.is_not(None))
+    if user_id is not None:
+        q = q.where(WorkSession.user_id == user_id)
+    q = q.order_by(WorkSession.user_id, WorkSession.started_at, WorkSession.id)
+
+    # 순회(스트리밍 커서)가 끝난 뒤에 쓰기 → 읽는 도중 같은 테이블을 바꾸지 않음
+    # 겹치는 그룹만 모아 두므로 메모리는 겹친 세션 수에 비례
+    merged = []
+    groups: List[Tuple[List[WorkSession], datetime]] = []
+    group: List[WorkSession] = []
+    end: Optional[datetime] = None
+    for ws in session.exec(q.execution_options(yield_per=batch)):
+        if group and ws.user_id == group[0].user_id and ws.started_at < end:
+            group.append(ws)
+            end = max(end, ws.ended_at)
+            continue
+        if len(group) > 1:
+            groups.append((group, end))
+        group, end = [ws], ws.ended_at
+    if len(group) > 1:
+        groups.append((group, end))
+
+    for g, e in groups:
+        merged.append((g[0].user_id, [x.id for x in g], g[0].started_at, e))
+        _flush_group(session, g, e, dry_run)
+    return merged
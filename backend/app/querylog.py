@@ -0,0 +1,119 @@
+# backend/app/querylog.py
+# 개발/스테이징용 쿼리 진단
+#  - 느린 쿼리 로그: SQL, 파라미터 형태(값 X), 소요 시간, 요청 경로
+#  - 요청 단위 중복 쿼리 감지: 같은 SQL이 N번 이상 반복되면 경고 (N+1 패턴)
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .settings import settings
+
+logger = logging.getLogger("ecy.sql")
+
+# 요청 단위 상태. 핸들러는 스레드풀에서 돌지만 contextvars는 복사되어 넘어가므로
+# 같은 dict 객체를 공유 → 핸들러 쪽에서 센 횟수를 미들웨어가 그대로 읽을 수 있음
+_request_state: ContextVar[Optional[dict]] = ContextVar("ecy_query_state", default=None)
+
+# session.get()은 "col AS tbl_col" 별칭을, refresh/select는 별칭 없는 SQL을 만든다.
+# 별칭/공백을 걷어내야 get → commit → refresh 같은 같은 행 재조회가 중복으로 잡힘
+_ALIAS_RE = re.compile(r"\s+AS\s+\w+", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    return " ".join(_ALIAS_RE.sub("", statement).split())
+
+
+def param_shape(params: Any, executemany: bool = False) -> str:
+    """파라미터 '형태'만 요약 (값은 로그에 남기지 않음)"""
+    if executemany and isinstance(params, (list, tuple)):
+        first = param_shape(params[0]) if params else "-"
+        return f"many x{len(params)} {first}"
+    if isinstance(params, dict):
+        return "{" + ",".join(sorted(map(str, params.keys()))) + "}"
+    if isinstance(params, (list, tuple)):
+        return f"({len(params)})"
+    return "-" if params is None else type(params).__name__
+
+
+# 시작 시각은 실행 컨텍스트(문장 1회 실행 단위)에 보관 → 실패한 문장은 after가 안 불려도
+# 컨텍스트와 함께 버려지므로 풀 연결에 값이 쌓이지 않음
+def _before(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._ecy_query_start = time.perf_counter()
+
+
+def _after(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_ecy_query_start", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    state = _request_state.get()
+    route = state["route"] if state else "-"
+    if state is not None:
+        state["counts"][normalize_sql(statement)] += 1
+
+    threshold = settings.SLOW_QUERY_MS
+    if threshold is not None and elapsed_ms >= threshold:
+        logger.warning(
+            "slow query %.1fms route=%s params=%s sql=%s",
+            elapsed_ms, route, param_shape(parameters, executemany), " ".join(statement.split()),
+        )
+
+
+def attach_engine(engine: Engine) -> None:
+    """엔진에 타이밍 리스너 부착 (중복 부착 방지)"""
+    if not event.contains(engine, "before_cursor_execute", _before):
+        event.listen(engine, "before_cursor_execute", _before)
+        event.listen(engine, "after_cursor_execute", _after)
+
+
+def setup_query_log(app, engine: Engine) -> None:
+    """설정이 켜져 있을 때만 리스너 + 요청 미들웨어 등록 (꺼져 있으면 오버헤드 0)"""
+    if settings.SLOW_QUERY_MS is None and settings.QUERY_DUP_WARN <= 0:
+        return
+
+    attach_engine(engine)
+
+    def report(state: dict) -> None:
+        limit = settings.QUERY_DUP_WARN
+        if limit > 0:
+            total = sum(state["counts"].values())
+            for sql, n in state["counts"].items():
+                if n >= limit:
+                    logger.warning(
+                        "duplicate query x%d (of %d) route=%s sql=%s", n, total, state["route"], sql,
+                    )
+
+    @app.middleware("http")
+    async def query_diagnostics(request: Request, call_next):
+        state = {"route": f"{request.method} {request.url.path}", "counts": Counter()}
+        token = _request_state.set(state)
+        try:
+            response = await call_next(request)
+        except BaseException:
+            report(state)
+            raise
+        finally:
+            _request_state.reset(token)
+
+        # 스트리밍 응답(내보내기 등)은 본문을 보내는 동안에도 쿼리가 나감 → 본문이 끝난 뒤 집계
+        # (본문을 도는 태스크도 같은 state dict 를 컨텍스트로 물려받아 계속 셈)
+        body = response.body_iterator
+
+        async def counted_body():
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                report(state)
+
+        response.body_iterator = counted_body()
+        return response
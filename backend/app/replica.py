@@ -0,0 +1,164 @@
+# backend/app/replica.py
+# 로컬 SQLite 읽기 복제본 (READ_REPLICA=true 일 때만)
+#  - 읽기 라우트(list_sessions, monthly_summary, list_items, list_links …)는 복제본에서 조회
+#  - 쓰기는 그대로 메인 DB(Neon) → 커밋 후 RETURNING 으로 받은 행을 복제본에 즉시 반영(mirror)
+#  - 백그라운드 동기화: 매 주기 version 증분(version > 마지막 커서) 변경 행 + 삭제 기록(Tombstone) 반영
+#    전체 재동기화는 기동 시 1회 (REPLICA_FULL_SYNC_EVERY > 0 이면 그 주기마다 추가로, 기본 꺼짐)
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Type
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from .database import engine as primary_engine, get_session, install_sqlite_pragmas
+from .changes import TRACKED, changes_since, current_version
+from .settings import settings
+
+logger = logging.getLogger("ecy.replica")
+
+REPLICATED = TRACKED
+
+replica_engine: Optional[Engine] = None
+if settings.READ_REPLICA:
+    Path(settings.REPLICA_PATH).parent.mkdir(parents=True, exist_ok=True)
+    replica_engine = create_engine(
+        f"sqlite:///{settings.REPLICA_PATH}",
+        connect_args={"check_same_thread": False},
+    )
+    install_sqlite_pragmas(replica_engine)
+
+
+def init_replica() -> None:
+    """복제본 테이블 재생성(복제 대상 3개만). 캐시이므로 스키마가 바뀌어도 지우고 다시 만듦"""
+    if replica_engine is None:
+        return
+    tables = [m.__table__ for m in REPLICATED]
+    SQLModel.metadata.drop_all(replica_engine, tables=tables)
+    SQLModel.metadata.create_all(replica_engine, tables=tables)
+
+
+def _upsert(conn, model: Type[SQLModel], rows: Iterable[dict]) -> int:
+    rows = list(rows)
+    if not rows:
+        return 0
+    table = model.__table__
+    stmt = sqlite_insert(table)
+    cols = {c.name: stmt.excluded[c.name] for c in table.columns if not c.primary_key}
+    conn.execute(stmt.on_conflict_do_update(index_elements=["id"], set_=cols), rows)
+    return len(rows)
+
+
+def _rows(objs) -> list:
+    return [o.model_dump() for o in objs]
+
+
+# 테이블별 마지막으로 반영한 version (행/삭제 기록 공통 번호 공간)
+_cursor: dict = {}
+
+
+def sync_once(full: bool = False) -> int:
+    """메인 → 복제본 동기화. 반영한 행(삭제 포함) 수 반환"""
+    if replica_engine is None:
+        return 0
+    moved = 0
+    for model in REPLICATED:
+        name = model.__tablename__
+        with Session(primary_engine) as src:
+            if full:
+                # 커서를 먼저 읽고 전체 조회 → 그 사이 쓰기/삭제는 다음 증분에서 반영(중복 upsert는 무해)
+                cursor = current_version(src, model)
+                rows = src.exec(select(model)).all()
+                deleted: list = []
+            else:
+                rows, deleted, cursor = changes_since(src, model, _cursor.get(name, 0))
+        with replica_engine.begin() as conn:
+            if full:
+                # 한 트랜잭션 안에서 비우고 다시 채움 → 읽는 쪽은 이전/이후만 봄
+                conn.execute(delete(model))
+            elif deleted:
+                conn.execute(delete(model).where(model.id.in_(deleted)))
+            moved += _upsert(conn, model, _rows(rows)) + len(deleted)
+        _cursor[name] = cursor
+    return moved
+
+
+def mirror(*objs: SQLModel) -> None:
+    """메인 DB 커밋 이후 호출: 방금 쓴 행을 복제본에도 반영 (read-your-writes).
+    실패해도 요청은 성공으로 두고 다음 동기화에서 맞춰지게 함"""
+    if replica_engine is None or not objs:
+        return
+    try:
+        with replica_engine.begin() as conn:
+            for o in objs:
+                _upsert(conn, type(o), [o.model_dump()])
+    except Exception:
+        logger.exception("replica mirror failed")
+
+
+def mirror_delete(model: Type[SQLModel], pk: int) -> None:
+    if replica_engine is None:
+        return
+    try:
+        with replica_engine.begin() as conn:
+            conn.execute(delete(model).where(model.id == pk))
+    except Exception:
+        logger.exception("replica mirror delete failed")
+
+
+def get_read_session():
+    """읽기 전용 요청 세션: 복제본이 켜져 있으면 로컬 SQLite, 아니면 메인 DB"""
+    if replica_engine is None:
+        yield from get_session()
+        return
+    with Session(replica_engine) as session:
+        yield session
+
+
+# ---- 백그라운드 동기화 ------------------------------------------------
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _run() -> None:
+    cycle = 0
+    while not _stop.wait(settings.REPLICA_SYNC_SEC):
+        cycle += 1
+        full = settings.REPLICA_FULL_SYNC_EVERY > 0 and cycle % settings.REPLICA_FULL_SYNC_EVERY == 0
+        try:
+            sync_once(full=full)
+        except DBAPIError as e:
+            logger.warning("replica sync failed (full=%s): %s", full, e)
+
+
+def prepare_replica() -> None:
+    """기동 시 1회: 테이블 재생성 + 전체 동기화(동기). 멀티 워커면 fork 전 마스터에서 실행"""
+    if replica_engine is None:
+        return
+    init_replica()
+    sync_once(full=True)
+
+
+def start_replica_sync() -> None:
+    """백그라운드 증분 동기화 시작 (멀티 워커면 한 프로세스에서만)"""
+    global _thread
+    if replica_engine is None:
+        return
+    if _thread and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="replica-sync", daemon=True)
+    _thread.start()
+
+
+def stop_replica_sync() -> None:
+    _stop.set()
+    if _thread:
+        _thread.join(5.0)
+    if replica_engine is not None:
+        replica_engine.dispose()
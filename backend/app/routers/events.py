@@ -0,0 +1,48 @@
+# app/routers/events.py
+# SSE 스트림: 타이머/우선순위/링크 변경을 푸시 → 클라이언트 폴링 불필요
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from starlette.responses import StreamingResponse
+
+from ..deps import current_user
+from ..events import hub, format_sse, CLOSED
+from ..settings import settings
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    topics: Optional[str] = Query(None, description="콤마 구분 토픽 필터 (timer,priority,links)"),
+    user_id: str = Depends(current_user),
+):
+    wanted = {t.strip() for t in topics.split(",") if t.strip()} if topics else None
+    sub = hub.subscribe(wanted, user_id)
+    heartbeat = settings.EVENTS_HEARTBEAT_SEC
+
+    async def generate():
+        try:
+            # 재연결 간격 힌트(ms) + 연결 확인용 첫 이벤트
+            yield "retry: 3000\nevent: ready\ndata: {}\n\n"
+            while True:
+                try:
+                    item = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"  # 프록시 유휴 타임아웃 방지용 주석 라인
+                    continue
+                if item is CLOSED:
+                    break
+                yield format_sse(*item)
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
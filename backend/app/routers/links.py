@@ -1,34 +1,62 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session, select
+from sqlalchemy import insert, update, delete
 from ..models import ResourceLink
 from ..database import get_session
 from ..deps import admin_guard
+from ..replica import get_read_session, mirror, mirror_delete
+from ..changes import record_tombstone, changes_since
+from ..events import publish, publish_row
 
 router = APIRouter(prefix="/links", tags=["links"])
 
+# 요청 바디에서 무시할 필드 (id/변경 추적 컬럼은 서버가 채움)
+_SERVER_FIELDS = {"id", "version", "updated_at"}
+
 @router.get("", response_model=List[ResourceLink])
-def list_links(session: Session = Depends(get_session)):
+def list_links(session: Session = Depends(get_read_session)):
     return session.exec(select(ResourceLink)).all()
 
+# 변경분 조회 (since 이후 바뀐 링크 + 삭제된 id)
+@router.get("/changes")
+def link_changes(since: int = Query(0, ge=0), session: Session = Depends(get_session)):
+    rows, deleted, cursor = changes_since(session, ResourceLink, since)
+    return {"version": cursor, "items": rows, "deleted": deleted}
+
 @router.post("", response_model=ResourceLink, dependencies=[Depends(admin_guard)])
 def add_link(link: ResourceLink, session: Session = Depends(get_session)):
-    link.id = None
-    session.add(link); session.commit(); session.refresh(link)
-    return link
+    # INSERT ... RETURNING: 삽입 + 결과 조회 한 번에
+    db = session.scalars(
+        insert(ResourceLink).values(**link.model_dump(exclude=_SERVER_FIELDS)).returning(ResourceLink)
+    ).one()
+    session.commit()
+    mirror(db)
+    publish_row("links", "created", db)
+    return db
 
 @router.put("/{lid}", response_model=ResourceLink, dependencies=[Depends(admin_guard)])
 def update_link(lid: int, link: ResourceLink, session: Session = Depends(get_session)):
-    db = session.get(ResourceLink, lid)
+    db = session.scalars(
+        update(ResourceLink)
+        .where(ResourceLink.id == lid)
+        .values(**link.model_dump(exclude=_SERVER_FIELDS))
+        .returning(ResourceLink)
+    ).one_or_none()
     if not db: raise HTTPException(404, "없음")
-    for k, v in link.model_dump(exclude={"id"}).items():
-        setattr(db, k, v)
-    session.add(db); session.commit(); session.refresh(db)
+    session.commit()
+    mirror(db)
+    publish_row("links", "updated", db)
     return db
 
 @router.delete("/{lid}", dependencies=[Depends(admin_guard)])
 def delete_link(lid: int, session: Session = Depends(get_session)):
-    db = session.get(ResourceLink, lid)
-    if not db: raise HTTPException(404, "없음")
-    session.delete(db); session.commit()
+    record_tombstone(session, ResourceLink, lid)  # 없는 id면 아래 404로 롤백
+    deleted = session.scalars(
+        delete(ResourceLink).where(ResourceLink.id == lid).returning(ResourceLink.id)
+    ).one_or_none()
+    if deleted is None: raise HTTPException(404, "없음")
+    session.commit()
+    mirror_delete(ResourceLink, lid)
+    publish("links", "deleted", id=lid)
     return {"ok": True}
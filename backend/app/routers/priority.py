@@ -12,10 +12,14 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from pydantic import BaseModel, Field as PydField
 from starlette.responses import StreamingResponse
 from sqlmodel import Session, select
+from sqlalchemy import insert, update, delete
 
 from ..models import PriorityItem
 from ..database import get_session
-from ..deps import admin_guard
+from ..deps import admin_guard, current_user
+from ..replica import get_read_session, mirror, mirror_delete
+from ..changes import record_tombstone, changes_since
+from ..events import publish, publish_row
 
 router = APIRouter(prefix="/priority", tags=["priority"])
 
@@ -71,6 +75,7 @@ class ItemOut(BaseModel):
     effective_due_at: datetime
     status: str
     minutes_until_due: int
+    version: Optional[int] = None
 
 def to_out(item: PriorityItem, now: datetime) -> ItemOut:
     eff_aware = effective_due_at(item, now)       # tz-aware
@@ -89,7 +94,8 @@ def to_out(item: PriorityItem, now: datetime) -> ItemOut:
         completed_week_start=item.completed_week_start,
         effective_due_at=eff_naive,
         status=status_of(item, now),
-        minutes_until_due=delta_min
+        minutes_until_due=delta_min,
+        version=item.version,
     )
 
 # ----- 생성/수정 입력 스키마 -----
@@ -120,9 +126,10 @@ class ItemUpdate(BaseModel):
 @router.get("", response_model=List[ItemOut])
 def list_items(
     q: Optional[str] = Query(None, description="책 이름 검색"),
-    session: Session = Depends(get_session),
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_read_session),
 ):
-    stmt = select(PriorityItem)
+    stmt = select(PriorityItem).where(PriorityItem.user_id == user_id)
     if q:
         stmt = stmt.where(PriorityItem.book.contains(q))
     items = session.exec(stmt).all()
@@ -135,65 +142,121 @@ def list_items(
     outs.sort(key=lambda o: (0 if o.effective_due_at >= now_naive else 1, o.effective_due_at))
     return outs
 
+# ----- 쓰기 헬퍼: 한 번의 왕복(... RETURNING)으로 갱신 + 최신 행 조회 -----
+def _own(pid: int, user_id: str):
+    # 다른 사용자 항목은 없는 것으로 취급(404)
+    return (PriorityItem.id == pid) & (PriorityItem.user_id == user_id)
+
+def _update_returning(
+    session: Session, pid: int, user_id: str, values: dict, action: str = "updated",
+) -> PriorityItem:
+    if not values:
+        # 바꿀 값이 없으면 UPDATE 대신 조회만
+        item = session.exec(select(PriorityItem).where(_own(pid, user_id))).first()
+    else:
+        item = session.scalars(
+            update(PriorityItem)
+            .where(_own(pid, user_id))
+            .values(**values)
+            .returning(PriorityItem)
+        ).one_or_none()
+    if not item:
+        raise HTTPException(404, "없음")
+    session.commit()
+    mirror(item)
+    publish_row("priority", action, item)
+    return item
+
 # 생성 (관리자)
 @router.post("", response_model=ItemOut, dependencies=[Depends(admin_guard)])
-def add_item(payload: ItemCreate, session: Session = Depends(get_session)):
-    item = PriorityItem(**payload.model_dump())
-    session.add(item)
+def add_item(
+    payload: ItemCreate,
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    item = session.scalars(
+        insert(PriorityItem).values(**payload.model_dump(), user_id=user_id).returning(PriorityItem)
+    ).one()
     session.commit()
-    session.refresh(item)
+    mirror(item)
+    publish_row("priority", "created", item)
     return to_out(item, datetime.now(KST))
 
 # 수정 (관리자)
 @router.put("/{pid}", response_model=ItemOut, dependencies=[Depends(admin_guard)])
-def update_item(pid: int, payload: ItemUpdate, session: Session = Depends(get_session)):
-    db = session.get(PriorityItem, pid)
-    if not db:
-        raise HTTPException(404, "없음")
-
-    for k, v in payload.model_dump(exclude_unset=True).items():
-        setattr(db, k, v)
-
-    session.add(db)
-    session.commit()
-    session.refresh(db)
-    return to_out(db, datetime.now(KST))
+def update_item(
+    pid: int,
+    payload: ItemUpdate,
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    item = _update_returning(session, pid, user_id, payload.model_dump(exclude_unset=True))
+    return to_out(item, datetime.now(KST))
 
 # 삭제 (관리자, 하드 삭제)
 @router.delete("/{pid}", dependencies=[Depends(admin_guard)])
-def delete_item(pid: int, session: Session = Depends(get_session)):
-    db = session.get(PriorityItem, pid)
-    if not db:
+def delete_item(
+    pid: int,
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    record_tombstone(session, PriorityItem, pid, user_id)  # 없는 id면 아래 404로 롤백
+    deleted = session.scalars(
+        delete(PriorityItem).where(_own(pid, user_id)).returning(PriorityItem.id)
+    ).one_or_none()
+    if deleted is None:
         raise HTTPException(404, "없음")
-    session.delete(db)
     session.commit()
+    mirror_delete(PriorityItem, pid)
+    publish("priority", "deleted", id=pid, user_id=user_id)
     return {"ok": True}
 
 # 완료(이번 주), 일반 사용자도 가능하게 열어둠
 @router.post("/{pid}/complete", response_model=ItemOut)
-def complete_item(pid: int, session: Session = Depends(get_session)):
+def complete_item(
+    pid: int,
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
     now = datetime.now(KST)
     ws = week_start_kst(now).date()
-    db = session.get(PriorityItem, pid)
-    if not db:
-        raise HTTPException(404, "없음")
-    db.completed_week_start = ws
-    session.add(db); session.commit(); session.refresh(db)
-    return to_out(db, now)
+    item = _update_returning(session, pid, user_id, {"completed_week_start": ws}, "completed")
+    return to_out(item, now)
 
 # 완료 취소
 @router.post("/{pid}/uncomplete", response_model=ItemOut)
-def uncomplete_item(pid: int, session: Session = Depends(get_session)):
-    db = session.get(PriorityItem, pid)
-    if not db:
-        raise HTTPException(404, "없음")
-    db.completed_week_start = None
-    session.add(db); session.commit(); session.refresh(db)
-    return to_out(db, datetime.now(KST))
+def uncomplete_item(
+    pid: int,
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    item = _update_returning(session, pid, user_id, {"completed_week_start": None}, "uncompleted")
+    return to_out(item, datetime.now(KST))
+
+# 변경분 조회 (since 이후 바뀐 항목 + 삭제된 id). /{pid} 보다 먼저 등록해야 함
+class ItemChanges(BaseModel):
+    version: int
+    items: List[ItemOut]
+    deleted: List[int]
 
-@router.get("/{pid}", response_model=ItemOut)
-def get_item(pid: int, session: Session = Depends(get_session)):
-    db = session.get(PriorityItem, pid)
+@router.get("/changes", response_model=ItemChanges)
+def item_changes(
+    since: int = Query(0, ge=0),
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    rows, deleted, cursor = changes_since(session, PriorityItem, since, user_id)
+    now = datetime.now(KST)
+    return ItemChanges(version=cursor, items=[to_out(i, now) for i in rows], deleted=deleted)
+
+# {pid:int}: 숫자만 매칭 → 아래 /export.csv 가 이 라우트에 가로채이지 않음
+@router.get("/{pid:int}", response_model=ItemOut)
+def get_item(
+    pid: int,
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_read_session),
+):
+    db = session.exec(select(PriorityItem).where(_own(pid, user_id))).first()
     if not db:
         raise HTTPException(404, "없음")
     return to_out(db, datetime.now(KST))
@@ -266,7 +329,11 @@ def _parse_links(v: Optional[str]) -> List[str]:
 
 # CSV Import (관리자)
 @router.post("/import-csv", dependencies=[Depends(admin_guard)])
-async def import_csv(file: UploadFile = File(...), session: Session = Depends(get_session)):
+async def import_csv(
+    file: UploadFile = File(...),
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
     """
     허용 컬럼:
     - book (필수)
@@ -299,6 +366,7 @@ async def import_csv(file: UploadFile = File(...), session: Session = Depends(ge
                 return None
 
         item = PriorityItem(
+            user_id=user_id,
             book=book,
             due_weekday=int(norm.get("due_weekday") or norm.get("weekday") or 0),
             due_hour=int(norm.get("due_hour") or norm.get("hour") or 0),
@@ -311,12 +379,16 @@ async def import_csv(file: UploadFile = File(...), session: Session = Depends(ge
         session.add(item); count += 1
 
     session.commit()
+    publish("priority", "imported", count=count, user_id=user_id)
     return {"ok": True, "imported": count}
 
 
 # CSV Export (관리자)
 @router.get("/export.csv", dependencies=[Depends(admin_guard)])
-def export_csv(session: Session = Depends(get_session)):
+def export_csv(
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_read_session),
+):
     """
     헤더:
     id,book,due_weekday,due_hour,due_minute,flags,links,memo,completed_week_start,effective_due_at,status
@@ -334,7 +406,7 @@ def export_csv(session: Session = Depends(get_session)):
         ])
         yield sio.getvalue(); sio.seek(0); sio.truncate(0)
 
-        items = session.exec(select(PriorityItem)).all()
+        items = session.exec(select(PriorityItem).where(PriorityItem.user_id == user_id)).all()
         for it in items:
             out = to_out(it, now)
             writer.writerow([
@@ -1,26 +1,31 @@
-from datetime import datetime
+from dataclasses import asdict
+from datetime import date, datetime
 from math import floor
 from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Depends, Query
+from starlette.responses import StreamingResponse
 from sqlmodel import Session, select
-from sqlalchemy import func
-from zoneinfo import ZoneInfo
+from sqlalchemy import func, update, delete
 
 from ..models import WorkSession
-from ..database import get_session
-from ..deps import admin_guard
+from ..database import engine, get_session
+from ..deps import admin_guard, current_user
+from ..timer_queue import get_timer_queue
+from ..sessions import KST, now_kst_native, open_session_returning, close_session_returning
+from ..replica import get_read_session, mirror, mirror_delete
+from ..changes import record_tombstone, changes_since
+from ..events import publish, publish_row
+from ..earnings import earnings_for
+from ..analytics import analytics
+from ..overlap import find_overlap
+from ..export import snapshot_version, iter_batches, stream_parquet, stream_arrow
+from ..settings import settings
 from ..schemas.timer_schema import SessionStart, SessionUpdate
 
 
 router = APIRouter(prefix="/timer", tags=["sessions"])
 
-KST = ZoneInfo("Asia/Seoul")
-
-def now_kst_native() -> datetime:
-    # 현재 KST 시각을 timezone-aware로 만든 뒤 tz 정보를 제거(naive)해서 반환.
-    # DB에는 'KST 기준 naive datetime'으로 저장/조회합니다.
-    return datetime.now(KST).replace(tzinfo=None)
 
 def month_bounds_kst(
     year: Optional[int],
@@ -36,37 +41,44 @@ def month_bounds_kst(
     end   = datetime(next_y, next_m, 1, 0, 0, 0)  # KST naive
     return start, end
 
+
 @router.post("/start", response_model=WorkSession)
 def start_session(
     payload: SessionStart,  # JSON 바디: { "memo": "..." }
+    user_id: str = Depends(current_user),
     session: Session = Depends(get_session),
 ):
-    active = session.exec(
-        select(WorkSession).where(WorkSession.ended_at.is_(None))
-    ).first()
-    if active:
+    queue = get_timer_queue()
+    if queue is not None:
+        # write-behind: 로컬 저널에 기록하고 즉시 응답 (id는 반영 후 부여)
+        ws = queue.start(user_id, payload.memo)
+    else:
+        ws = open_session_returning(session, user_id, now_kst_native(), payload.memo)
+        session.commit()
+        if ws:
+            mirror(ws)
+    if not ws:
         raise HTTPException(400, "이미 진행 중인 타이머가 있습니다.")
-
-    ws = WorkSession(started_at=now_kst_native(), memo=payload.memo)
-    session.add(ws)
-    session.commit()
-    session.refresh(ws)
+    publish_row("timer", "started", ws)
     return ws
 
 
 @router.post("/stop", response_model=WorkSession)
-def stop_session(session: Session = Depends(get_session)):
-    ws = session.exec(
-        select(WorkSession).where(WorkSession.ended_at.is_(None))
-    ).first()
+def stop_session(
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    queue = get_timer_queue()
+    if queue is not None:
+        ws = queue.stop(user_id)
+    else:
+        ws = close_session_returning(session, user_id, now_kst_native())
+        session.commit()
+        if ws:
+            mirror(ws)
     if not ws:
         raise HTTPException(400, "진행 중인 타이머가 없습니다.")
-
-    ws.ended_at = now_kst_native()
-    ws.minutes = floor((ws.ended_at - ws.started_at).total_seconds() / 60)
-    session.add(ws)
-    session.commit()
-    session.refresh(ws)
+    publish_row("timer", "stopped", ws)
     return ws
 
 
@@ -74,7 +86,8 @@ def stop_session(session: Session = Depends(get_session)):
 def list_sessions(
     year: Optional[int] = Query(None, ge=1),
     month: Optional[int] = Query(None, ge=1, le=12),
-    session: Session = Depends(get_session),
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_read_session),
 ):
     # year/month 미지정 시 → 현재 KST 기준으로 보정
     if year is None or month is None:
@@ -89,7 +102,11 @@ def list_sessions(
 
     stmt = (
         select(WorkSession)
-        .where(WorkSession.started_at >= start, WorkSession.started_at < end)
+        .where(
+            WorkSession.user_id == user_id,  # (user_id, started_at) 인덱스 범위 스캔
+            WorkSession.started_at >= start,
+            WorkSession.started_at < end,
+        )
         .order_by(WorkSession.started_at.desc())
     )
     return session.exec(stmt).all()
@@ -99,50 +116,168 @@ def list_sessions(
 def monthly_summary(
     year: int,
     month: int,
-    session: Session = Depends(get_session),
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_read_session),
 ):
     start, end = month_bounds_kst(year, month)
 
     total_minutes = session.exec(
         select(func.coalesce(func.sum(WorkSession.minutes), 0)).where(
+            WorkSession.user_id == user_id,
             WorkSession.started_at >= start,
             WorkSession.started_at < end,
         )
-    ).scalar_one()  # ← 정수로 바로
+    ).one()  # ← 정수로 바로 (exec는 스칼라 결과를 돌려줌)
 
     return {"year": year, "month": month, "total_minutes": total_minutes}
 
 
-# 잘못 측정한 시간 수정(관리자) — JSON 바디 사용
+# 급여: month 생략 시 1~12월. 바뀌지 않은 달은 저장된 결과(cached=true)를 그대로 반환
+# detail=true 면 해당 달 세션별 내역도 포함(항상 새로 계산)
+@router.get("/earnings")
+def earnings(
+    year: int,
+    month: Optional[int] = Query(None, ge=1, le=12),
+    detail: bool = False,
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    months = [month] if month else list(range(1, 13))
+    out = []
+    for r in earnings_for(session, user_id, year, months, detail=detail):
+        item = {
+            "month": r.month,
+            "sessions": r.earning.sessions,
+            "minutes": r.earning.minutes,
+            "night_minutes": r.earning.night_minutes,
+            "weekend_minutes": r.earning.weekend_minutes,
+            "pay": r.earning.pay,
+            "cached": r.cached,
+        }
+        if detail:
+            item["items"] = [asdict(p) for p in r.items]
+        out.append(item)
+    return {"year": year, "total_pay": sum(i["pay"] for i in out), "months": out}
+
+
+# 근무 패턴 분석: 요일×시간 히트맵 + 세션 길이 분포. 기간 [start, end) (KST 날짜, 기본 이번 달)
+# bins: 길이 히스토그램 구간 경계(분, 콤마 구분)
+@router.get("/analytics")
+def session_analytics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    bins: Optional[str] = Query(None, description="예: 0,30,60,120,240"),
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_read_session),
+):
+    m_start, m_end = month_bounds_kst(None, None)
+    lo = datetime.combine(start, datetime.min.time()) if start else m_start
+    hi = datetime.combine(end, datetime.min.time()) if end else m_end
+    if hi <= lo:
+        raise HTTPException(400, "end는 start 이후여야 합니다.")
+    try:
+        edges = [int(b) for b in bins.split(",") if b.strip()] if bins else None
+    except ValueError:
+        raise HTTPException(400, "bins는 콤마로 구분한 정수여야 합니다.")
+
+    result, cached = analytics(session, user_id, lo, hi, edges)
+    return {"start": lo, "end": hi, "cached": cached, **result}
+
+
+# 컬럼형 내보내기: since(version) 이후 종료 세션을 row group 단위로 스트리밍
+# 응답 헤더 X-Export-Version 을 다음 증분 요청의 since 로 사용
+def _export_response(since: int, user_id: str, fmt: str) -> StreamingResponse:
+    with Session(engine) as s:
+        upto = snapshot_version(s, user_id)
+
+    def generate():
+        # 응답 스트리밍 동안 쓸 세션은 여기서 따로 염(요청 DI 세션은 먼저 닫힐 수 있음)
+        with Session(engine) as s:
+            batches = iter_batches(s, user_id, since, upto, settings.EXPORT_BATCH_SIZE)
+            yield from (stream_parquet(batches) if fmt == "parquet" else stream_arrow(batches))
+
+    media = "application/vnd.apache.parquet" if fmt == "parquet" else "application/vnd.apache.arrow.stream"
+    return StreamingResponse(
+        generate(),
+        media_type=media,
+        headers={
+            "Content-Disposition": f'attachment; filename="sessions-{since}-{upto}.{fmt}"',
+            "X-Export-Version": str(upto),
+        },
+    )
+
+
+@router.get("/export.parquet")
+def export_parquet(since: int = Query(0, ge=0), user_id: str = Depends(current_user)):
+    return _export_response(since, user_id, "parquet")
+
+
+@router.get("/export.arrow")
+def export_arrow(since: int = Query(0, ge=0), user_id: str = Depends(current_user)):
+    return _export_response(since, user_id, "arrow")
+
+
+# 변경분 조회: since(마지막으로 받은 version) 이후 바뀐 세션 + 삭제된 id
+# 응답의 version을 다음 요청의 since로 사용. since=0 이면 전체
+@router.get("/changes")
+def session_changes(
+    since: int = Query(0, ge=0),
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    rows, deleted, cursor = changes_since(session, WorkSession, since, user_id)
+    return {"version": cursor, "items": rows, "deleted": deleted}
+
+
+# 잘못 측정한 시간 수정(관리자) — JSON 바디 사용. 대상 사용자는 X-User-Id 헤더(관리자 코드와 함께)
 @router.put("/{sid}", response_model=WorkSession, dependencies=[Depends(admin_guard)])
 def update_session(
     sid: int,
     body: SessionUpdate,  # JSON 바디: { started_at, ended_at, memo }
+    user_id: str = Depends(current_user),
     session: Session = Depends(get_session),
 ):
     if body.ended_at <= body.started_at:
         raise HTTPException(400, "종료가 시작보다 빠를 수 없습니다.")
+    # 다른 세션과 겹치면 월 합계가 이중 집계됨 → 거부
+    other = find_overlap(session, user_id, body.started_at, body.ended_at, exclude_id=sid)
+    if other:
+        raise HTTPException(409, f"다른 세션(#{other.id})과 시간이 겹칩니다.")
 
-    ws = session.get(WorkSession, sid)
+    ws = session.scalars(
+        update(WorkSession)
+        .where(WorkSession.id == sid, WorkSession.user_id == user_id)
+        .values(
+            started_at=body.started_at,
+            ended_at=body.ended_at,
+            memo=body.memo,
+            minutes=floor((body.ended_at - body.started_at).total_seconds() / 60),
+        )
+        .returning(WorkSession)
+    ).one_or_none()
     if not ws:
         raise HTTPException(404, "없음")
-
-    ws.started_at = body.started_at
-    ws.ended_at = body.ended_at
-    ws.memo = body.memo
-    ws.minutes = floor((body.ended_at - body.started_at).total_seconds() / 60)
-
-    session.add(ws)
     session.commit()
-    session.refresh(ws)
+    mirror(ws)
+    publish_row("timer", "updated", ws)
     return ws
 
 
 @router.delete("/{sid}", dependencies=[Depends(admin_guard)])
-def delete_session(sid: int, session: Session = Depends(get_session)):
-    ws = session.get(WorkSession, sid)
-    if not ws:
+def delete_session(
+    sid: int,
+    user_id: str = Depends(current_user),
+    session: Session = Depends(get_session),
+):
+    record_tombstone(session, WorkSession, sid, user_id)  # 없는 id면 아래 404로 롤백
+    deleted = session.scalars(
+        delete(WorkSession)
+        .where(WorkSession.id == sid, WorkSession.user_id == user_id)
+        .returning(WorkSession.id)
+    ).one_or_none()
+    if deleted is None:
         raise HTTPException(404, "없음")
-    session.delete(ws)
     session.commit()
+    mirror_delete(WorkSession, sid)
+    publish("timer", "deleted", id=sid, user_id=user_id)
     return {"ok": True}
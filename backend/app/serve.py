@@ -0,0 +1,170 @@
+# backend/app/serve.py
+# 운영 실행기: python -m app.serve  (backend/ 에서)
+#  - 마스터에서 앱을 미리 import(preload) + init_db/복제본 초기 동기화를 한 번 → fork 한 워커들이 공유
+#    워커는 WEB_INIT_DB=false 로 기동 → 동시에 create_all/ALTER/복제본 재생성을 돌리며 경합하지 않음
+#  - 백그라운드 작업(write-behind 큐 반영, 복제본 증분 동기화, SQLite optimize)은 0번 워커에서만
+#    (나머지는 WEB_BACKGROUND_JOBS=false). 0번 워커가 죽어 다시 뜨면 그대로 이어받음
+#  - SSE(/events) 허브는 프로세스 메모리 → 워커별. 다른 워커가 처리한 쓰기 이벤트는 그 워커에
+#    연결된 구독자에게만 감. 실시간 알림이 모두에게 필요하면 --workers 1 로 실행
+#  - 마스터가 소켓을 열고 워커 N개가 같은 소켓에서 accept
+#  - uvloop/httptools 가 설치돼 있으면 사용 (uvicorn[standard] 에 포함, Windows는 uvloop 없음)
+#  - SIGTERM/SIGINT: 워커에 SIGTERM 전달 → uvicorn이 새 연결 중단, 진행 중 요청 대기 후 shutdown 훅
+#    (큐 flush, 동기화 스레드 종료, engine.dispose) 실행. WEB_GRACEFUL_TIMEOUT_SEC 넘으면 강제 종료
+#  - 워커가 비정상 종료하면 다시 띄움
+#  - fork가 없는 환경(Windows)은 uvicorn 기본 멀티프로세스(spawn, preload 없음)로 실행
+#    이때 워커를 고를 수 없으므로 TIMER_WRITE_BEHIND/READ_REPLICA 와 workers > 1 조합은 거부
+import argparse
+import importlib.util
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+
+from .settings import settings
+
+logger = logging.getLogger("ecy.serve")
+
+
+def _pick(module: str, name: str, fallback: str) -> str:
+    return name if importlib.util.find_spec(module) is not None else fallback
+
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Master:
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.children: Dict[int, int] = {}  # pid → 슬롯 번호
+        self.stopping = False
+
+    def _spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = slot
+            return
+        # ── 워커 ──
+        code = 0
+        settings.WEB_BACKGROUND_JOBS = slot == 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            uvicorn.Server(self.config).run(sockets=[self.sock])
+        except BaseException:
+            logger.exception("worker %d crashed", slot)
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _on_signal(self, signum, _frame) -> None:
+        self.stopping = True
+
+    def run(self) -> None:
+        for slot in range(self.workers):
+            self._spawn(slot)
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+        logger.info("serving on %s with %d workers", self.sock.getsockname(), self.workers)
+
+        # waitpid는 시그널이 와도 자동 재시도(PEP 475)되므로 짧은 주기로 폴링
+        while not self.stopping:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if not pid:
+                time.sleep(0.5)
+                continue
+            slot = self.children.pop(pid, None)
+            if slot is not None and not self.stopping:
+                logger.warning("worker %d (pid %d) exited with %d, restarting", slot, pid, status)
+                time.sleep(1.0)  # 시작 직후 죽는 경우 과도한 재시작 방지
+                self._spawn(slot)
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+        deadline = time.monotonic() + settings.WEB_GRACEFUL_TIMEOUT_SEC + 5
+        while self.children and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        for pid in self.children:
+            logger.warning("worker pid %d did not stop in time, killing", pid)
+            os.kill(pid, signal.SIGKILL)
+        self.sock.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="ECY API production server")
+    ap.add_argument("--host", default=settings.WEB_HOST)
+    ap.add_argument("--port", type=int, default=settings.WEB_PORT)
+    ap.add_argument("--workers", type=int, default=settings.WEB_WORKERS, help="0이면 CPU 코어 수")
+    ap.add_argument("--log-level", default="info")
+    args = ap.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    opts = dict(
+        loop=_pick("uvloop", "uvloop", "asyncio"),
+        http=_pick("httptools", "httptools", "h11"),
+        timeout_keep_alive=settings.WEB_KEEPALIVE_SEC,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT_SEC,
+        backlog=settings.WEB_BACKLOG,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        log_level=args.log_level,
+    )
+
+    if workers == 1:
+        uvicorn.run("app.main:app", host=args.host, port=args.port, **opts)
+        return
+
+    from .database import init_db, engine
+
+    if not hasattr(os, "fork"):
+        if settings.TIMER_WRITE_BEHIND or settings.READ_REPLICA:
+            sys.exit("TIMER_WRITE_BEHIND/READ_REPLICA need a single background process: "
+                     "use --workers 1 on platforms without fork")
+        init_db()
+        engine.dispose()
+        os.environ["WEB_INIT_DB"] = "false"  # spawn 된 워커는 설정을 새로 읽음
+        uvicorn.run("app.main:app", host=args.host, port=args.port, workers=workers, **opts)
+        return
+
+    # preload: 앱/라우터/무거운 의존성 import + 스키마/복제본 준비를 마스터에서 한 번
+    from .main import app
+    from .replica import prepare_replica, replica_engine
+
+    init_db()
+    prepare_replica()
+    # 마스터 연결을 워커가 물려받지 않도록 fork 전에 정리
+    engine.dispose()
+    if replica_engine is not None:
+        replica_engine.dispose()
+    settings.WEB_INIT_DB = False
+
+    config = uvicorn.Config(app, **opts)
+    logger.setLevel(args.log_level.upper())
+    logger.info("loop=%s http=%s keep-alive=%ss", config.loop, config.http, config.timeout_keep_alive)
+    Master(config, _bind(args.host, args.port, settings.WEB_BACKLOG), workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
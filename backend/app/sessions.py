@@ -0,0 +1,65 @@
+# backend/app/sessions.py
+# 근무 세션 시작/종료 공통 로직 (라우터 /timer, write-behind 큐가 같이 사용)
+#  - 시작: INSERT ... SELECT ... WHERE NOT EXISTS(활성 세션) RETURNING *
+#  - 종료: UPDATE ... RETURNING * (minutes도 DB에서 계산)
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert, update, literal
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from zoneinfo import ZoneInfo
+
+from .models import WorkSession
+from .database import elapsed_minutes_expr
+
+KST = ZoneInfo("Asia/Seoul")
+
+def now_kst_native() -> datetime:
+    # 현재 KST 시각을 timezone-aware로 만든 뒤 tz 정보를 제거(naive)해서 반환.
+    # DB에는 'KST 기준 naive datetime'으로 저장/조회합니다.
+    return datetime.now(KST).replace(tzinfo=None)
+
+def active_of(user_id: str):
+    # 사용자의 활성 세션(ended_at IS NULL) 조건 — 부분 유니크 인덱스 ux_worksession_user_active 로 조회
+    return (WorkSession.user_id == user_id) & WorkSession.ended_at.is_(None)
+
+
+def open_session_returning(
+    session: Session, user_id: str, started_at: datetime, memo: Optional[str],
+    queue_event: Optional[str] = None,
+) -> Optional[WorkSession]:
+    # INSERT ... SELECT ... WHERE NOT EXISTS(활성 세션) RETURNING *
+    # → 중복 체크 + 삽입 + 결과 조회를 한 번의 왕복으로. 이미 활성 세션이 있으면 None
+    # 동시 요청이 NOT EXISTS를 같이 통과해도 부분 유니크 인덱스가 두 번째를 막음
+    # queue_event: write-behind 큐의 시작 이벤트 id (유니크 → 같은 이벤트를 두 번 반영하지 않음)
+    row = select(
+        literal(user_id, WorkSession.user_id.type),
+        literal(started_at, WorkSession.started_at.type),
+        literal(memo, WorkSession.memo.type),
+        literal(queue_event, WorkSession.queue_event.type),
+    ).where(~select(WorkSession.id).where(active_of(user_id)).exists())
+    try:
+        return session.scalars(
+            insert(WorkSession)
+            .from_select(["user_id", "started_at", "memo", "queue_event"], row)
+            .returning(WorkSession)
+        ).one_or_none()
+    except IntegrityError:
+        session.rollback()
+        return None
+
+
+def close_session_returning(session: Session, user_id: str, ended_at: datetime) -> Optional[WorkSession]:
+    # minutes도 DB에서 계산해 UPDATE ... RETURNING 한 번으로 끝냄. 활성 세션이 없으면 None
+    return session.scalars(
+        update(WorkSession)
+        .where(active_of(user_id))
+        .values(ended_at=ended_at, minutes=elapsed_minutes_expr(ended_at, WorkSession.started_at))
+        .returning(WorkSession)
+    ).first()
+
+
+def session_by_queue_event(session: Session, queue_event: str) -> Optional[WorkSession]:
+    """이미 반영된 큐 시작 이벤트의 세션 (재반영 확인용)"""
+    return session.exec(select(WorkSession).where(WorkSession.queue_event == queue_event)).first()
@@ -1,15 +1,33 @@
 from __future__ import annotations
 
 import json
+from datetime import date
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 
-from pydantic import field_validator
+from pydantic import BaseModel, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_DIR = Path(__file__).resolve().parent.parent  # backend/
 DEFAULT_STATIC = (BASE_DIR / "frontend" / "dist").as_posix()
 DEFAULT_DB     = (BASE_DIR / "data" / "ecy.db").as_posix()
+DEFAULT_TIMER_QUEUE = (BASE_DIR / "data" / "timer_queue.db").as_posix()
+DEFAULT_REPLICA = (BASE_DIR / "data" / "replica.db").as_posix()
+
+
+class PayRate(BaseModel):
+    """시급 1건: effective_from 부터 적용. user_id가 있으면 그 사용자 전용"""
+    effective_from: date
+    hourly: int
+    user_id: Optional[str] = None
+
+
+# 기본값: 최저임금(원/시간)
+DEFAULT_PAY_RATES = [
+    PayRate(effective_from=date(2024, 1, 1), hourly=9860),
+    PayRate(effective_from=date(2025, 1, 1), hourly=10030),
+    PayRate(effective_from=date(2026, 1, 1), hourly=10320),
+]
 
 
 class Settings(BaseSettings):
@@ -37,6 +55,93 @@ class Settings(BaseSettings):
     # 간단 관리자 보호용 헤더 코드
     ADMIN_CODE: Optional[str] = None
 
+    # 사용자 구분
+    # - USER_TOKENS: 토큰 → 사용자 id (JSON 객체 {"긴-무작위-토큰": "kim", ...}).
+    #   요청은 Authorization: Bearer <토큰> 으로 사용자를 밝힘. 비우면 1인 배포 → 모두 DEFAULT_USER_ID
+    # - 관리자(X-Admin-Code)만 X-User-Id 헤더로 다른 사용자를 지정할 수 있음
+    USER_TOKENS: Dict[str, str] = {}
+    DEFAULT_USER_ID: str = "default"
+
+    # SQLite 연결별 PRAGMA 프로파일 (새 연결마다 적용. 0/빈 값이면 해당 PRAGMA 생략)
+    # - CACHE_SIZE: 음수면 KiB 단위(-20000 ≈ 20MB), MMAP_SIZE: 바이트
+    # - OPTIMIZE_SEC: 이 주기(초)마다 PRAGMA optimize (0이면 기동 시 1회만)
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -20000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_FOREIGN_KEYS: bool = True
+    SQLITE_OPTIMIZE_SEC: float = 3600.0
+
+    # 개발/스테이징용 쿼리 진단
+    # - SLOW_QUERY_MS: 이 값(ms) 이상 걸린 쿼리를 로그로 남김 (비우면 비활성화)
+    # - QUERY_DUP_WARN: 한 요청 안에서 같은 SQL이 이 횟수 이상 반복되면 경고 (0이면 비활성화)
+    SLOW_QUERY_MS: Optional[float] = None
+    QUERY_DUP_WARN: int = 0
+
+    # 타이머 write-behind 큐 (start/stop을 로컬 저널에 먼저 기록 → 백그라운드로 메인 DB 반영)
+    TIMER_WRITE_BEHIND: bool = False
+    TIMER_QUEUE_PATH: str = DEFAULT_TIMER_QUEUE
+    TIMER_QUEUE_FLUSH_SEC: float = 2.0
+
+    # 로컬 SQLite 읽기 복제본 (읽기는 복제본, 쓰기는 메인 DB)
+    # - REPLICA_SYNC_SEC: 증분 동기화 주기(초)
+    # - REPLICA_FULL_SYNC_EVERY: N번째 주기마다 전체 재동기화 (0이면 기동 시 1회만)
+    #   삭제도 Tombstone 으로 증분 반영되므로 기본은 0. 켜면 매번 세 테이블을 통째로 다시 읽음
+    READ_REPLICA: bool = False
+    REPLICA_PATH: str = DEFAULT_REPLICA
+    REPLICA_SYNC_SEC: float = 5.0
+    REPLICA_FULL_SYNC_EVERY: int = 0
+
+    # SSE(/events) 하트비트 간격(초)
+    EVENTS_HEARTBEAT_SEC: float = 15.0
+
+    # 급여 계산(/timer/earnings)
+    # - PAY_RATES: JSON 배열 [{"effective_from":"2026-01-01","hourly":10320,"user_id":null}, ...]
+    # - 배율은 가산 방식: 야간+주말이면 1 + (야간-1) + (주말-1)
+    # - 야간 구간: NIGHT_START_HOUR ~ 다음날 NIGHT_END_HOUR (KST)
+    PAY_RATES: List[PayRate] = DEFAULT_PAY_RATES
+    PAY_NIGHT_MULTIPLIER: float = 1.5
+    PAY_WEEKEND_MULTIPLIER: float = 1.0
+    PAY_NIGHT_START_HOUR: int = 22
+    PAY_NIGHT_END_HOUR: int = 6
+
+    # 분석(/timer/analytics) 결과 캐시 개수(사용자×기간×구간 조합, 프로세스 메모리)
+    ANALYTICS_CACHE_SIZE: int = 64
+
+    # 내보내기(/timer/export.parquet, export_sessions.py) 배치 = row group 행 수
+    EXPORT_BATCH_SIZE: int = 10_000
+
+    # 운영 실행(python -m app.serve)
+    # - WEB_WORKERS: 0이면 CPU 코어 수
+    # - WEB_KEEPALIVE_SEC: 유휴 keep-alive 연결 유지(초). 앞단 프록시/LB 유휴 타임아웃보다 길게
+    # - WEB_GRACEFUL_TIMEOUT_SEC: 종료 신호 후 진행 중 요청을 기다리는 최대 시간(초)
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 0
+    WEB_KEEPALIVE_SEC: int = 75
+    WEB_GRACEFUL_TIMEOUT_SEC: int = 30
+    WEB_BACKLOG: int = 2048
+    # 프로세스 역할 (실행기가 워커별로 지정. 단일 프로세스 실행은 둘 다 true 그대로)
+    # - WEB_INIT_DB: 기동 시 스키마 준비(init_db) + 복제본 초기 동기화
+    # - WEB_BACKGROUND_JOBS: 큐 반영/복제본 동기화/SQLite optimize 스레드 실행
+    WEB_INIT_DB: bool = True
+    WEB_BACKGROUND_JOBS: bool = True
+
+    # 응답 압축: Accept-Encoding 협상(br > gzip), MIN_SIZE(바이트) 미만은 그대로
+    # - 스트리밍 응답은 크기와 무관하게 조각 단위 압축
+    # - EXCLUDE_TYPES: 접두사 일치하는 Content-Type은 압축 안 함(이미 압축된 형식, SSE)
+    COMPRESS_ENABLED: bool = True
+    COMPRESS_MIN_SIZE: int = 1024
+    COMPRESS_GZIP_LEVEL: int = 6
+    COMPRESS_BROTLI_QUALITY: int = 4
+    COMPRESS_EXCLUDE_TYPES: List[str] = [
+        "text/event-stream",
+        "image/", "video/", "audio/", "font/woff",
+        "application/zip", "application/gzip", "application/x-brotli",
+        "application/vnd.apache.parquet",
+    ]
+
     # ---- Validators -------------------------------------------------
 
     @field_validator("CORS_ORIGINS", mode="before")
@@ -71,6 +176,16 @@ class Settings(BaseSettings):
             p = BASE_DIR / p  # backend 기준 상대경로 보정
         return p.resolve().as_posix()
 
+    @field_validator("TIMER_QUEUE_PATH", "REPLICA_PATH", mode="before")
+    @classmethod
+    def _abs_local_db(cls, v: str, info) -> str:
+        if not v:
+            return {"TIMER_QUEUE_PATH": DEFAULT_TIMER_QUEUE, "REPLICA_PATH": DEFAULT_REPLICA}[info.field_name]
+        p = Path(v)
+        if not p.is_absolute():
+            p = BASE_DIR / p
+        return p.resolve().as_posix()
+
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
     def _normalize_sqlite(cls, v: str) -> str:
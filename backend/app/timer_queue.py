@@ -0,0 +1,251 @@
+# backend/app/timer_queue.py
+# 타이머 write-behind 큐
+#  - /timer/start, /timer/stop 이벤트를 로컬 SQLite 저널 파일에 먼저 기록하고 즉시 응답
+#  - 백그라운드 스레드가 기록 순서(seq)대로 메인 DB(Neon)에 반영
+#  - Neon 콜드 스타트(수 초) 동안에도 타이머 클릭이 멈추지 않게 하는 용도
+#
+# "사용자당 활성 세션은 하나" 규칙
+#  - 접수 시: 사용자별 로컬 상태(timer_state)로 판정 → 이미 진행 중이면 start 거절, 없으면 stop 거절
+#  - 반영 시: start는 메인 DB에 활성 세션이 이미 있으면, stop은 활성 세션이 없으면
+#    'conflict'로 표시하고 건너뜀(메인 DB가 우선)
+#  - 로컬 상태 재동기화(메인 DB 활성 세션 조회)는 이벤트를 반영한 뒤 큐가 비었을 때만
+#    → 할 일이 없으면 메인 DB에 쿼리를 보내지 않아 Neon이 유휴 상태로 잠들 수 있음
+#
+# 중복 반영 방지: 이벤트마다 event_id(uuid)를 두고 시작 세션의 queue_event 컬럼(유니크)에 저장
+#  - 메인 DB 커밋 후 저널에 done 표시 전에 죽거나 타임아웃이 나도, 재반영 시 이미 있는 세션을 찾아 done 처리
+#  - 종료는 "활성 세션이 있을 때만" 갱신하고 이벤트는 순서대로 반영되므로 재반영해도 바뀌지 않음
+import logging
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from math import floor
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import Session, select
+
+from .models import WorkSession
+from .sessions import now_kst_native, open_session_returning, close_session_returning, session_by_queue_event
+from .replica import mirror
+from .settings import settings
+
+logger = logging.getLogger("ecy.timer_queue")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS timer_event (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id   TEXT NOT NULL,              -- 메인 DB 중복 반영 방지 키 (uuid hex)
+    user_id    TEXT NOT NULL,
+    kind       TEXT NOT NULL CHECK (kind IN ('start', 'stop')),
+    at         TEXT NOT NULL,              -- KST naive ISO
+    memo       TEXT,
+    status     TEXT NOT NULL DEFAULT 'pending'  -- pending | done | conflict
+);
+CREATE INDEX IF NOT EXISTS ix_timer_event_pending ON timer_event(status, seq);
+CREATE TABLE IF NOT EXISTS timer_state (
+    user_id    TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,              -- 로컬 기준 활성 세션 시작 시각 (행이 없으면 비활성)
+    memo       TEXT
+);
+"""
+
+
+class TimerQueue:
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # autocommit 모드 + 명시적 BEGIN IMMEDIATE: 여러 워커 프로세스가 같은 파일을 써도 직렬화
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")  # 접수 = 디스크 기록 완료
+        self._upgrade_single_user_journal()
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._resync = True  # 기동 후 첫 유휴 주기에 한 번 로컬 상태를 맞춤
+
+    def _upgrade_single_user_journal(self) -> None:
+        """사용자 구분 이전에 만든 저널이면 기존 이벤트/상태를 DEFAULT_USER_ID 소유로 옮김"""
+        cols = {r[1] for r in self._db.execute("PRAGMA table_info(timer_event)")}
+        if cols and "user_id" not in cols:
+            self._db.execute(
+                "ALTER TABLE timer_event ADD COLUMN user_id TEXT NOT NULL DEFAULT ''"
+            )
+            self._db.execute("UPDATE timer_event SET user_id = ?", (settings.DEFAULT_USER_ID,))
+        if cols and "event_id" not in cols:
+            self._db.execute("ALTER TABLE timer_event ADD COLUMN event_id TEXT")
+            self._db.execute("UPDATE timer_event SET event_id = lower(hex(randomblob(16)))")
+        state_cols = {r[1] for r in self._db.execute("PRAGMA table_info(timer_state)")}
+        if "k" in state_cols:
+            row = self._db.execute("SELECT started_at, memo FROM timer_state WHERE k = 1").fetchone()
+            self._db.execute("DROP TABLE timer_state")
+            self._db.executescript(_SCHEMA)
+            if row and row[0]:
+                self._db.execute(
+                    "INSERT INTO timer_state (user_id, started_at, memo) VALUES (?, ?, ?)",
+                    (settings.DEFAULT_USER_ID, row[0], row[1]),
+                )
+
+    # ---- 접수 (요청 스레드) -------------------------------------------
+
+    def _record(self, kind: str, user_id: str, memo: Optional[str]) -> Optional[WorkSession]:
+        now = now_kst_native()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._db.execute(
+                    "SELECT started_at, memo FROM timer_state WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                started, cur_memo = state if state else (None, None)
+                if (kind == "start") == (started is not None):
+                    self._db.execute("ROLLBACK")
+                    return None
+                self._db.execute(
+                    "INSERT INTO timer_event (event_id, user_id, kind, at, memo) VALUES (?, ?, ?, ?, ?)",
+                    (uuid.uuid4().hex, user_id, kind, now.isoformat(), memo),
+                )
+                if kind == "start":
+                    self._db.execute(
+                        "INSERT INTO timer_state (user_id, started_at, memo) VALUES (?, ?, ?)",
+                        (user_id, now.isoformat(), memo),
+                    )
+                else:
+                    self._db.execute("DELETE FROM timer_state WHERE user_id = ?", (user_id,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        self._wake.set()
+
+        if kind == "start":
+            return WorkSession(user_id=user_id, started_at=now, memo=memo)
+        st = datetime.fromisoformat(started)
+        return WorkSession(
+            user_id=user_id, started_at=st, ended_at=now, memo=cur_memo,
+            minutes=floor((now - st).total_seconds() / 60),
+        )
+
+    def start(self, user_id: str, memo: Optional[str]) -> Optional[WorkSession]:
+        """로컬 기준 그 사용자가 진행 중이면 None"""
+        return self._record("start", user_id, memo)
+
+    def stop(self, user_id: str) -> Optional[WorkSession]:
+        """로컬 기준 그 사용자의 진행 중인 세션이 없으면 None"""
+        return self._record("stop", user_id, None)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM timer_event WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    # ---- 반영 (백그라운드 스레드) -------------------------------------
+
+    def flush(self, engine: Engine) -> int:
+        """대기 이벤트를 순서대로 메인 DB에 반영. 반영(또는 충돌 처리)한 건수 반환.
+        메인 DB 오류 시 예외를 그대로 올림 → 해당 이벤트부터 다음 주기에 재시도"""
+        with self._lock:
+            events = self._db.execute(
+                "SELECT seq, event_id, user_id, kind, at, memo FROM timer_event "
+                "WHERE status = 'pending' ORDER BY seq"
+            ).fetchall()
+
+        done = 0
+        for seq, event_id, user_id, kind, at, memo in events:
+            at_dt = datetime.fromisoformat(at)
+            # expire_on_commit=False: 커밋 후에도 RETURNING 값이 남아 있어야 복제본에 그대로 반영
+            with Session(engine, expire_on_commit=False) as s:
+                if kind == "start":
+                    # 이전 시도에서 커밋까지 됐으면 그 세션을 그대로 사용 (다시 INSERT 하지 않음)
+                    ws = session_by_queue_event(s, event_id) or open_session_returning(
+                        s, user_id, at_dt, memo, queue_event=event_id,
+                    )
+                else:
+                    ws = close_session_returning(s, user_id, at_dt)
+                s.commit()
+            if ws:
+                mirror(ws)
+            status = "done" if ws else "conflict"
+            if not ws:
+                logger.warning(
+                    "timer event #%d (%s %s @ %s) conflicts with primary; skipped", seq, user_id, kind, at,
+                )
+            with self._lock:
+                self._db.execute("UPDATE timer_event SET status = ? WHERE seq = ?", (status, seq))
+            done += 1
+
+        if events:
+            self._resync = True
+        elif self._resync:
+            self._resync = not self._sync_state(engine)
+        return done
+
+    def _sync_state(self, engine: Engine) -> bool:
+        """큐가 비었을 때 메인 DB의 활성 세션들로 로컬 상태를 맞춤(충돌/외부 수정 반영).
+        조회하는 사이 새 이벤트가 들어와 건너뛰었으면 False"""
+        with Session(engine) as s:
+            active = s.exec(select(WorkSession).where(WorkSession.ended_at.is_(None))).all()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            pending = self._db.execute(
+                "SELECT COUNT(*) FROM timer_event WHERE status = 'pending'"
+            ).fetchone()[0]
+            if pending == 0:  # 조회하는 사이 새 이벤트가 들어왔으면 건드리지 않음
+                self._db.execute("DELETE FROM timer_state")
+                self._db.executemany(
+                    "INSERT INTO timer_state (user_id, started_at, memo) VALUES (?, ?, ?)",
+                    [(a.user_id, a.started_at.isoformat(), a.memo) for a in active],
+                )
+            self._db.execute("COMMIT")
+        return pending == 0
+
+    def _run(self, engine: Engine) -> None:
+        interval = settings.TIMER_QUEUE_FLUSH_SEC
+        backoff = interval
+        while not self._stop.is_set():
+            self._wake.clear()  # 반영 중 들어온 이벤트는 wait가 바로 깨어나 다음 루프에서 처리
+            try:
+                self.flush(engine)
+                backoff = interval
+            except DBAPIError as e:
+                # 콜드 스타트/네트워크 오류 → 지수 백오프 후 재시도 (최대 60초)
+                logger.warning("timer queue flush failed (retry in %.0fs): %s", backoff, e)
+                backoff = min(backoff * 2, 60.0)
+            self._wake.wait(backoff)
+
+    def start_background(self, engine: Engine) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(engine,), name="timer-queue", daemon=True)
+        self._thread.start()
+
+    def shutdown(self, engine: Engine, timeout: float = 5.0) -> None:
+        """백그라운드 중단 + 마지막 1회 반영 시도(실패해도 저널에 남아 다음 기동 때 반영)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        try:
+            self.flush(engine)
+        except DBAPIError as e:
+            logger.warning("timer queue final flush failed; %d events kept: %s", self.pending_count(), e)
+
+
+_queue: Optional[TimerQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_timer_queue() -> Optional[TimerQueue]:
+    """TIMER_WRITE_BEHIND가 켜져 있을 때만 큐 인스턴스(최초 호출 시 생성), 아니면 None"""
+    global _queue
+    if not settings.TIMER_WRITE_BEHIND:
+        return None
+    with _queue_lock:
+        if _queue is None:
+            _queue = TimerQueue(settings.TIMER_QUEUE_PATH)
+    return _queue
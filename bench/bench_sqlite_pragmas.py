@@ -0,0 +1,81 @@
+# bench/bench_sqlite_pragmas.py
+# 로컬 SQLite 배포 기준 PRAGMA 프로파일 효과 측정
+#  - default : PRAGMA 없음(드라이버 기본값, rollback journal + synchronous=FULL)
+#  - profile : database.sqlite_pragmas() (WAL + synchronous=NORMAL + cache/mmap/temp_store …)
+# 쓰기: 한 건씩 INSERT+COMMIT (타이머 start/stop 과 같은 패턴)
+# 읽기: 월 범위 started_at 조회 (list_sessions 와 같은 쿼리), 여러 스레드에서 동시 실행
+#
+# 사용 예:
+#   python bench/bench_sqlite_pragmas.py --writes 2000 --reads 2000 --threads 4
+from __future__ import annotations
+import argparse, random, sys, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from backend.app.database import install_sqlite_pragmas, sqlite_pragmas
+from backend.app.models import WorkSession
+
+
+def make_engine(path: Path, pragmas):
+    eng = create_engine(f"sqlite:///{path.as_posix()}", connect_args={"check_same_thread": False})
+    if pragmas:
+        install_sqlite_pragmas(eng, pragmas)
+    SQLModel.metadata.create_all(eng)
+    return eng
+
+
+def bench_writes(eng, n: int) -> float:
+    base = datetime(2024, 1, 1)
+    t0 = time.perf_counter()
+    for i in range(n):
+        with Session(eng) as s:
+            st = base + timedelta(hours=i)
+            s.add(WorkSession(started_at=st, ended_at=st + timedelta(minutes=90), minutes=90))
+            s.commit()
+    return n / (time.perf_counter() - t0)
+
+
+def bench_reads(eng, n: int, threads: int, months: int) -> float:
+    def one(_):
+        m = random.randrange(months)
+        start = datetime(2024 + m // 12, m % 12 + 1, 1)
+        end = start + timedelta(days=31)
+        with Session(eng) as s:
+            s.exec(
+                select(WorkSession)
+                .where(WorkSession.started_at >= start, WorkSession.started_at < end)
+                .order_by(WorkSession.started_at.desc())
+            ).all()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as ex:
+        list(ex.map(one, range(n)))
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="SQLite PRAGMA 프로파일 처리량 벤치마크")
+    ap.add_argument("--writes", type=int, default=1000)
+    ap.add_argument("--reads", type=int, default=2000)
+    ap.add_argument("--threads", type=int, default=4)
+    args = ap.parse_args()
+
+    months = max(1, args.writes // (24 * 30))
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, pragmas in (("default", None), ("profile", sqlite_pragmas())):
+            eng = make_engine(Path(tmp) / f"{label}.db", pragmas)
+            w = bench_writes(eng, args.writes)
+            r = bench_reads(eng, args.reads, args.threads, months)
+            eng.dispose()
+            print(f"[{label:<7}] writes {w:9.0f} tx/s   reads {r:9.0f} q/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench/bench_txt_parser.py
+# .txt 로그 파서 비교: parse_txt_lines(줄마다 strip + ROW_RE + Row) vs parse_txt_columns(mmap + bytes finditer)
+#  - 합성 로그 파일(형식 오류 줄 일부 포함)을 만들어 처리 시간 / 최대 메모리(tracemalloc) 측정
+#
+# 사용 예:
+#   python bench/bench_txt_parser.py --lines 1000000 --bad-every 1000
+from __future__ import annotations
+import argparse, random, sys, tempfile, time, tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from txt_to_neon import parse_txt_lines, parse_txt_columns
+
+
+def make_log(path: Path, lines: int, bad_every: int) -> None:
+    rnd = random.Random(0)
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(1, lines + 1):
+            if bad_every and i % bad_every == 0:
+                f.write("?? broken line\n")
+                continue
+            sh, sm = rnd.randrange(1, 12), rnd.randrange(60)
+            eh, em = rnd.randrange(1, 12), rnd.randrange(60)
+            f.write(f"[v] {rnd.randrange(1, 13)}/{rnd.randrange(1, 29)} {sh}:{sm:02d} ~ {eh}:{em:02d}\n")
+
+
+def legacy(path: str) -> int:
+    return len(list(parse_txt_lines(path)))
+
+
+def columns(path: str) -> int:
+    return len(parse_txt_columns(path))
+
+
+def measure(fn, path: str, mem: bool):
+    if mem:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    n = fn(path)
+    dt = time.perf_counter() - t0
+    peak = 0
+    if mem:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return n, dt, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description="txt 로그 파서 벤치마크")
+    ap.add_argument("--lines", type=int, default=500_000)
+    ap.add_argument("--bad-every", type=int, default=1000, help="N줄마다 형식 오류 줄 1개(0이면 없음)")
+    ap.add_argument("--input", default=None, help="합성 대신 기존 파일 사용")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input
+        if path is None:
+            path = str(Path(tmp) / "log.txt")
+            make_log(Path(path), args.lines, args.bad_every)
+        size = Path(path).stat().st_size
+        print(f"[i] {path} ({size / 1e6:.1f} MB)")
+
+        results = {}
+        for label, fn in (("parse_txt_lines", legacy), ("parse_txt_columns", columns)):
+            n, dt, _ = measure(fn, path, mem=False)
+            _, _, peak = measure(fn, path, mem=True)  # 시간은 tracemalloc 없이 따로 측정
+            results[label] = dt
+            print(f"[{label:<17}] rows {n:>9}  {dt:7.2f} s  {size / 1e6 / dt:7.1f} MB/s  peak {peak / 1e6:8.1f} MB")
+        print(f"[speedup] x{results['parse_txt_lines'] / results['parse_txt_columns']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
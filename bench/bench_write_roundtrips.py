@@ -0,0 +1,120 @@
+# bench/bench_write_roundtrips.py
+# 쓰기 경로 왕복 횟수/지연 비교: 기존(add → commit → refresh) vs RETURNING
+# 원격 DB(Neon) 대용으로 로컬 SQLite 엔진에 "쿼리당 지연"을 주입해서 측정
+#
+# 사용 예:
+#   python bench/bench_write_roundtrips.py --latency-ms 20 --rounds 50
+from __future__ import annotations
+import argparse, statistics, sys, tempfile, time
+from math import floor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from backend.app.models import WorkSession, PriorityItem
+from backend.app.settings import settings
+from backend.app.routers.timer import start_session, stop_session, now_kst_native
+from backend.app.routers.priority import complete_item, week_start_kst, KST
+from backend.app.schemas.timer_schema import SessionStart
+from datetime import datetime
+
+
+USER = settings.DEFAULT_USER_ID
+
+
+def make_engine(path: Path, latency_ms: float, counter: list):
+    eng = create_engine(f"sqlite:///{path.as_posix()}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(eng, "before_cursor_execute")
+    def _inject(conn, cursor, statement, parameters, context, executemany):
+        counter[0] += 1
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    SQLModel.metadata.create_all(eng)
+    return eng
+
+
+# ---- 기존(베이스라인) 구현 재현 ----
+def legacy_start(s: Session, memo):
+    active = s.exec(select(WorkSession).where(WorkSession.ended_at.is_(None))).first()
+    assert not active
+    ws = WorkSession(started_at=now_kst_native(), memo=memo)
+    s.add(ws); s.commit(); s.refresh(ws)
+    return ws
+
+def legacy_stop(s: Session):
+    ws = s.exec(select(WorkSession).where(WorkSession.ended_at.is_(None))).first()
+    ws.ended_at = now_kst_native()
+    ws.minutes = floor((ws.ended_at - ws.started_at).total_seconds() / 60)
+    s.add(ws); s.commit(); s.refresh(ws)
+    return ws
+
+def legacy_complete(s: Session, pid: int):
+    db = s.get(PriorityItem, pid)
+    db.completed_week_start = week_start_kst(datetime.now(KST)).date()
+    s.add(db); s.commit(); s.refresh(db)
+    return db
+
+
+def run(label, eng, counter, rounds, expire_on_commit, ops):
+    with Session(eng) as s:
+        s.add(PriorityItem(book="bench", due_weekday=0, due_hour=0, due_minute=0))
+        s.commit()
+        pid = s.exec(select(PriorityItem.id)).first()
+
+    results = {}
+    for name, fn in ops:
+        samples, trips = [], []
+        for _ in range(rounds):
+            with Session(eng, expire_on_commit=expire_on_commit) as s:
+                before = counter[0]
+                t0 = time.perf_counter()
+                fn(s, pid)
+                samples.append((time.perf_counter() - t0) * 1000)
+                trips.append(counter[0] - before)
+        results[name] = (statistics.median(samples), statistics.median(trips))
+    print(f"[{label}]")
+    for name, (ms, n) in results.items():
+        print(f"  {name:<10} median {ms:8.2f} ms   queries/op {n:.0f}")
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="RETURNING 쓰기 경로 왕복 비교 벤치마크")
+    ap.add_argument("--latency-ms", type=float, default=20.0, help="쿼리당 주입 지연(ms)")
+    ap.add_argument("--rounds", type=int, default=30)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        c_old, c_new = [0], [0]
+        old = make_engine(Path(tmp) / "legacy.db", args.latency_ms, c_old)
+        new = make_engine(Path(tmp) / "returning.db", args.latency_ms, c_new)
+
+        # start → stop 을 한 쌍으로 묶어 활성 세션 불변식 유지
+        legacy_ops = [
+            ("start+stop", lambda s, pid: (legacy_start(s, "b"), legacy_stop(s))),
+            ("complete", lambda s, pid: legacy_complete(s, pid)),
+        ]
+        returning_ops = [
+            ("start+stop", lambda s, pid: (
+                start_session(SessionStart(memo="b"), user_id=USER, session=s),
+                stop_session(user_id=USER, session=s),
+            )),
+            ("complete", lambda s, pid: complete_item(pid, user_id=USER, session=s)),
+        ]
+        r_old = run("legacy add/commit/refresh", old, c_old, args.rounds, True, legacy_ops)
+        r_new = run("RETURNING", new, c_new, args.rounds, False, returning_ops)
+
+        print("[speedup]")
+        for name in r_old:
+            print(f"  {name:<10} x{r_old[name][0] / r_new[name][0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
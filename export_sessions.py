@@ -0,0 +1,85 @@
+# export_sessions.py
+# WorkSession → Parquet / Arrow IPC 내보내기 (BI 적재용)
+# 사용 예:
+#   python export_sessions.py --out sessions.parquet
+#   python export_sessions.py --out sessions.arrow --format arrow --user default
+#   python export_sessions.py --out exports/ --incremental      # 지난번 이후 바뀐 세션만 새 part 파일로 추가
+#
+# 증분 모드: --out 디렉터리에 _export_state.json({"version": N}) 을 두고
+#   part-<since+1>-<upto>.parquet 를 하나씩 추가. 같은 id가 여러 part에 있으면 version 큰 행이 최신
+
+from __future__ import annotations
+import argparse, json, sys, time
+from pathlib import Path
+
+# ---- 프로젝트 임포트 경로 보정 (레포 루트 기준) ----
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlmodel import Session
+
+from backend.app.settings import settings
+from backend.app.database import engine
+from backend.app.export import snapshot_version, iter_batches, write_parquet, write_arrow
+
+STATE_FILE = "_export_state.json"
+
+
+def load_state(out_dir: Path) -> int:
+    p = out_dir / STATE_FILE
+    if not p.exists():
+        return 0
+    return int(json.loads(p.read_text(encoding="utf-8")).get("version", 0))
+
+
+def save_state(out_dir: Path, version: int) -> None:
+    tmp = out_dir / (STATE_FILE + ".tmp")
+    tmp.write_text(json.dumps({"version": version}), encoding="utf-8")
+    tmp.replace(out_dir / STATE_FILE)  # 파일을 다 쓴 뒤에만 커서 전진
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export WorkSession rows to Parquet / Arrow IPC")
+    ap.add_argument("--out", required=True, help="출력 파일(증분 모드면 디렉터리)")
+    ap.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    ap.add_argument("--user", default=None, help="사용자 id (생략 시 전체)")
+    ap.add_argument("--since", type=int, default=0, help="이 version 이후만 (증분 모드에선 상태 파일 값 사용)")
+    ap.add_argument("--incremental", action="store_true", help="디렉터리에 part 파일 추가 + 커서 저장")
+    ap.add_argument("--batch", type=int, default=settings.EXPORT_BATCH_SIZE, help="row group 행 수")
+    ap.add_argument("--compression", default="zstd", help="parquet 압축(zstd/snappy/gzip/none)")
+    args = ap.parse_args()
+
+    out = Path(args.out)
+    since = args.since
+    if args.incremental:
+        out.mkdir(parents=True, exist_ok=True)
+        since = load_state(out)
+
+    t0 = time.perf_counter()
+    with Session(engine) as s:
+        upto = snapshot_version(s, args.user)
+        if upto <= since:
+            print(f"[i] nothing new (version {since})")
+            return
+        target = out / f"part-{since + 1:010d}-{upto:010d}.{args.format}" if args.incremental else out
+        tmp = target.with_name(target.name + ".tmp")
+        batches = iter_batches(s, args.user, since, upto, args.batch)
+        with tmp.open("wb") as f:
+            if args.format == "parquet":
+                n = write_parquet(batches, f, compression=args.compression)
+            else:
+                n = write_arrow(batches, f)
+
+    if n == 0 and args.incremental:
+        tmp.unlink()  # 진행 중 세션만 바뀐 경우: 빈 part는 만들지 않고 커서만 전진
+    else:
+        tmp.replace(target)
+        print(f"[i] wrote {n} rows → {target} ({target.stat().st_size:,} bytes)")
+    if args.incremental:
+        save_state(out, upto)
+    print(f"[✔] version {since} → {upto} in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# merge_sessions.py
+# 겹치는 WorkSession 병합 (유지보수용)
+# 사용 예:
+#   python merge_sessions.py --dry-run            # 병합 대상만 출력
+#   python merge_sessions.py                      # 전체 사용자
+#   python merge_sessions.py --user default
+#
+# (user_id, started_at) 순으로 전체 이력을 한 번 훑어, 겹치는 종료 세션들을
+# 가장 이른 세션 하나로 합침(끝 = 그룹 최대 종료, 메모는 이어 붙임). 나머지는 삭제 기록을 남기고 삭제
+
+from __future__ import annotations
+import argparse, sys, time
+from pathlib import Path
+
+# ---- 프로젝트 임포트 경로 보정 (레포 루트 기준) ----
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlmodel import Session
+
+from backend.app.settings import settings
+from backend.app.database import engine
+from backend.app.overlap import merge_overlaps
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Merge overlapping work sessions")
+    ap.add_argument("--user", default=None, help="사용자 id (생략 시 전체)")
+    ap.add_argument("--dry-run", action="store_true", help="변경 없이 병합 대상만 출력")
+    ap.add_argument("--batch", type=int, default=1000, help="스트리밍 읽기 배치 크기")
+    args = ap.parse_args()
+
+    print(f"[i] DB URL = {settings.DATABASE_URL}")
+    t0 = time.perf_counter()
+    with Session(engine) as s:
+        groups = merge_overlaps(s, args.user, dry_run=args.dry_run, batch=args.batch)
+        for user_id, ids, st, en in groups:
+            print(f"  - {user_id}: #{ids[0]} ← {ids[1:]}  {st:%Y-%m-%d %H:%M} ~ {en:%Y-%m-%d %H:%M}")
+        if not args.dry_run:
+            s.commit()
+
+    removed = sum(len(ids) - 1 for _, ids, _, _ in groups)
+    verb = "would merge" if args.dry_run else "merged"
+    print(f"[✔] {verb} {len(groups)} groups ({removed} sessions removed) in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# migrate_db.py
+# SQLModel 테이블 전체를 DB ↔ DB 로 복사 (로컬 SQLite ↔ Neon)
+# 사용 예:
+#   python migrate_db.py --src sqlite:///data/ecy.db --dst "$NEON_URL" --create-tables
+#   python migrate_db.py --src "$NEON_URL" --dst sqlite:///data/ecy.db --create-tables --truncate
+#   (sqlite 상대 경로는 DATABASE_URL 과 같이 backend/ 기준)
+#   python migrate_db.py --src ... --dst ... --verify-only
+#
+# - 읽기: 테이블별 PK 순 스트리밍(yield_per → Postgres는 서버 측 커서)
+# - 쓰기: 배치 단위 INSERT ... ON CONFLICT(id) DO UPDATE (다시 실행해도 안전), 배치마다 커밋
+# - 테이블별 병렬(--workers). 대상이 SQLite면 쓰기 잠금 때문에 1개로 고정
+# - 대상이 Postgres면 모든 테이블의 id 시퀀스를 MAX(id)로 보정 (txt_to_neon.fix_pg_sequence 일반화)
+# - 마지막에 테이블별 행 수 + 체크섬(PK 순 정규화 행의 sha256) 비교
+# - 원본에 없는 컬럼(예: 예전 스키마)은 대상 기본값 사용, 비교에서도 제외
+
+from __future__ import annotations
+import argparse, hashlib, json, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Tuple
+
+# ---- 프로젝트 임포트 경로 보정 (레포 루트 기준) ----
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlmodel import SQLModel, create_engine
+from sqlalchemy import Table, inspect, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from backend.app import models  # noqa: F401  (메타데이터에 테이블 등록)
+from backend.app.settings import settings, BASE_DIR
+from backend.app.database import install_sqlite_pragmas
+
+
+def make_engine(url: str) -> Engine:
+    if url.startswith("sqlite"):
+        # 상대 경로는 backend/ 기준(settings.DATABASE_URL 과 동일 규칙)
+        path = url.split(":///", 1)[1]
+        if not Path(path).is_absolute():
+            url = f"sqlite:///{(BASE_DIR / path).resolve().as_posix()}"
+        eng = create_engine(url, connect_args={"check_same_thread": False})
+        install_sqlite_pragmas(eng)
+        return eng
+    return create_engine(url, pool_pre_ping=True)
+
+
+def is_sqlite(eng: Engine) -> bool:
+    return eng.dialect.name == "sqlite"
+
+
+def common_columns(src: Engine, table: Table) -> List[str]:
+    have = {c["name"] for c in inspect(src).get_columns(table.name)}
+    return [c.name for c in table.columns if c.name in have]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 복사
+# ──────────────────────────────────────────────────────────────────────────────
+def _upsert_stmt(dst: Engine, table: Table, cols: List[str]):
+    ins = (sqlite_insert if is_sqlite(dst) else pg_insert)(table)
+    pk = [c.name for c in table.primary_key.columns]
+    update = {c: ins.excluded[c] for c in cols if c not in pk}
+    return ins.on_conflict_do_update(index_elements=pk, set_=update) if update else ins.on_conflict_do_nothing()
+
+
+def copy_table(src: Engine, dst: Engine, table: Table, batch: int, truncate: bool) -> Tuple[str, int, float]:
+    t0 = time.perf_counter()
+    cols = common_columns(src, table)
+    missing = [c.name for c in table.columns if c.name not in cols]
+    if missing:
+        print(f"  ! {table.name}: source lacks {missing} → destination defaults")
+    stmt = _upsert_stmt(dst, table, cols)
+    pk = list(table.primary_key.columns)
+
+    moved = 0
+    with src.connect() as sconn:
+        if truncate:
+            with dst.begin() as dconn:
+                dconn.execute(table.delete())
+        result = sconn.execution_options(yield_per=batch).execute(
+            select(*[table.c[c] for c in cols]).order_by(*pk)
+        )
+        for part in result.partitions():
+            rows = [dict(zip(cols, r)) for r in part]
+            with dst.begin() as dconn:
+                dconn.execute(stmt, rows)
+            moved += len(rows)
+            print(f"  - {table.name}: {moved}")
+    return table.name, moved, time.perf_counter() - t0
+
+
+def fix_sequences(dst: Engine, tables: List[Table]) -> None:
+    """Postgres: 명시 id로 넣은 뒤 시퀀스를 MAX(id)로 (빈 테이블이면 다음 값 1)"""
+    if is_sqlite(dst):
+        return  # SQLModel 테이블은 AUTOINCREMENT 없음 → rowid가 MAX(id)+1 로 이어짐
+    with dst.begin() as conn:
+        for t in tables:
+            pk = list(t.primary_key.columns)
+            if len(pk) != 1 or not pk[0].autoincrement or pk[0].type.python_type is not int:
+                continue
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence(:t, :c), "
+                f"COALESCE((SELECT MAX({pk[0].name}) FROM {t.name}), 1), "
+                f"(SELECT MAX({pk[0].name}) FROM {t.name}) IS NOT NULL)"
+            ), {"t": t.name, "c": pk[0].name})
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 검증
+# ──────────────────────────────────────────────────────────────────────────────
+def _norm(v):
+    # 방언마다 달라지는 표현을 맞춤 (JSON 키 순서, 날짜 문자열화, Decimal/float)
+    if isinstance(v, (dict, list)):
+        return json.dumps(v, sort_keys=True, ensure_ascii=False)
+    if isinstance(v, datetime):
+        return v.replace(tzinfo=None).isoformat()
+    if isinstance(v, date):
+        return v.isoformat()
+    if isinstance(v, (Decimal, float)):
+        return repr(float(v))
+    return v
+
+
+def table_digest(eng: Engine, table: Table, cols: List[str], batch: int) -> Tuple[int, str]:
+    h = hashlib.sha256()
+    n = 0
+    with eng.connect() as conn:
+        result = conn.execution_options(yield_per=batch).execute(
+            select(*[table.c[c] for c in cols]).order_by(*table.primary_key.columns)
+        )
+        for part in result.partitions():
+            for r in part:
+                h.update(repr(tuple(_norm(v) for v in r)).encode())
+                n += 1
+    return n, h.hexdigest()
+
+
+def verify(src: Engine, dst: Engine, tables: List[Table], batch: int, workers: int) -> bool:
+    def one(t: Table):
+        cols = common_columns(src, t)
+        return t.name, table_digest(src, t, cols, batch), table_digest(dst, t, cols, batch)
+
+    ok = True
+    with ThreadPoolExecutor(workers) as ex:
+        for name, (sn, sh), (dn, dh) in ex.map(one, tables):
+            same = sn == dn and sh == dh
+            ok &= same
+            print(f"  {'✔' if same else '✘'} {name:<16} rows {sn:>8} / {dn:<8} sha256 {sh[:12]} / {dh[:12]}")
+    return ok
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# main
+# ──────────────────────────────────────────────────────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="Copy all SQLModel tables between two databases (SQLite ↔ Postgres)")
+    ap.add_argument("--src", default="sqlite:///data/ecy.db", help="원본 DB URL (기본: 로컬 SQLite)")
+    ap.add_argument("--dst", default=settings.DATABASE_URL, help="대상 DB URL (기본: 설정의 DATABASE_URL)")
+    ap.add_argument("--tables", default=None, help="콤마 구분 테이블 이름(기본: 전체)")
+    ap.add_argument("--batch", type=int, default=1000, help="읽기/쓰기 배치 크기")
+    ap.add_argument("--workers", type=int, default=4, help="병렬 테이블 수")
+    ap.add_argument("--create-tables", action="store_true", help="대상에 테이블 생성(SQLModel metadata)")
+    ap.add_argument("--truncate", action="store_true", help="복사 전에 대상 테이블 비우기")
+    ap.add_argument("--verify-only", action="store_true", help="복사 없이 행 수/체크섬만 비교")
+    args = ap.parse_args()
+
+    src, dst = make_engine(args.src), make_engine(args.dst)
+    print(f"[i] SRC = {src.url.render_as_string(hide_password=True)}")
+    print(f"[i] DST = {dst.url.render_as_string(hide_password=True)}")
+
+    src_tables = set(inspect(src).get_table_names())
+    tables = [t for t in SQLModel.metadata.sorted_tables if t.name in src_tables]
+    if args.tables:
+        wanted = {x.strip() for x in args.tables.split(",")}
+        tables = [t for t in tables if t.name in wanted]
+    print(f"[i] tables: {', '.join(t.name for t in tables)}")
+
+    workers = max(1, args.workers)
+    if is_sqlite(dst):
+        workers = 1
+
+    if not args.verify_only:
+        if args.create_tables:
+            SQLModel.metadata.create_all(dst, tables=tables)
+        t0 = time.perf_counter()
+        # 현재 모델에는 테이블 간 FK가 없어 순서 무관하게 병렬 복사
+        with ThreadPoolExecutor(workers) as ex:
+            for name, n, dt in ex.map(lambda t: copy_table(src, dst, t, args.batch, args.truncate), tables):
+                print(f"[i] {name}: {n} rows in {dt:.2f}s")
+        fix_sequences(dst, tables)
+        print(f"[i] copied in {time.perf_counter() - t0:.2f}s")
+
+    print("[i] verifying…")
+    if not verify(src, dst, tables, args.batch, max(1, args.workers)):
+        print("[✘] mismatch")
+        sys.exit(1)
+    print("[✔] done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,13 @@
 # 사용 예:
 #   python txt_to_neon.py --input data.txt --assume-pm --batch 1000 --create-tables
 #   python txt_to_neon.py --input data.txt --dry-run
+#   python txt_to_neon.py --input kim.txt --user kim   # 다른 사용자 소유로 가져오기
 
 from __future__ import annotations
-import argparse, re
+import argparse, mmap, re
+from array import array
 from dataclasses import dataclass
+from itertools import islice
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Iterator, Optional, Any, List, Dict
@@ -24,6 +27,7 @@ from sqlalchemy import text
 from backend.app.settings import settings
 from backend.app.models import WorkSession
 from backend.app.database import engine as dest_engine  # Neon 엔진
+from backend.app.overlap import load_index
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 1) .txt 포맷 파싱
@@ -78,6 +82,58 @@ def parse_txt_lines(path: str) -> Iterator[Row]:
                 em=int(gd["em"]),
             )
 
+# ── 대용량(수 GB) 아카이브용: mmap + bytes finditer 한 번으로 전체 스캔 ──
+# 줄마다 객체를 만들지 않고 컬럼별 array('B')에 바로 적재.
+# 모든 줄이 정확히 한 번 매치되도록 "정상 | 그 외" 두 갈래로 구성 → 매치 순번 = 줄 번호
+ROW_RE_BYTES = re.compile(
+    rb"^[ \t]*(?:"
+    rb"(?:\[[^\]\r\n]*\][ \t]*)?"
+    rb"(\d{1,2})/(\d{1,2})[ \t]+(\d{1,2}):(\d{2})[ \t]*~[ \t]*(\d{1,2}):(\d{2})[ \t]*"
+    rb"|(?P<bad>[^\r\n]*)"
+    rb")\r?$",
+    re.MULTILINE,
+)
+
+@dataclass
+class RowColumns:
+    month: array
+    day: array
+    sh: array
+    sm: array
+    eh: array
+    em: array
+    skipped: array  # 포맷이 안 맞는 줄 번호(1부터). 빈 줄/# 주석은 제외
+
+    def __len__(self) -> int:
+        return len(self.month)
+
+    def rows(self) -> Iterator[Row]:
+        """parse_txt_lines 와 같은 Row 이터레이터(기존 업로드 경로 재사용용)"""
+        for t in zip(self.month, self.day, self.sh, self.sm, self.eh, self.em):
+            yield Row(*t)
+
+def parse_txt_columns(path: str) -> RowColumns:
+    out = RowColumns(*(array("B") for _ in range(6)), skipped=array("L"))
+    a_mo, a_d, a_sh, a_sm, a_eh, a_em = (
+        out.month.append, out.day.append, out.sh.append, out.sm.append, out.eh.append, out.em.append,
+    )
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        if size == 0:
+            return out
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            for lineno, m in enumerate(ROW_RE_BYTES.finditer(buf), 1):
+                mo, d, sh, sm, eh, em, bad = m.groups()
+                if bad is None:
+                    a_mo(int(mo)); a_d(int(d)); a_sh(int(sh)); a_sm(int(sm)); a_eh(int(eh)); a_em(int(em))
+                    continue
+                if m.start() == size:  # 마지막 개행 뒤의 빈 매치
+                    break
+                b = bad.strip()
+                if b and not b.startswith(b"#"):
+                    out.skipped.append(lineno)
+    return out
+
 def to_iso_kst(year: int, month: int, day: int, hour: int, minute: int,
                assume_pm: bool, tz_offset="+09:00") -> str:
     """로컬 텍스트 시간을 ISO8601(+09:00)로 변환.
@@ -125,18 +181,34 @@ def main():
                     help="1~11시를 오후로 간주(예: 3:29 → 15:29)")
     ap.add_argument("--tz", default="+09:00", help="타임존 오프셋(기본 +09:00)")
     ap.add_argument("--dry-run", action="store_true", help="쓰기 없이 파싱/건수만 확인")
+    ap.add_argument("--on-overlap", choices=["skip", "error", "allow"], default="skip",
+                    help="기존/앞선 세션과 시간이 겹치는 줄 처리(기본 skip: 건너뛰고 줄 정보 출력)")
+    ap.add_argument("--user", default=settings.DEFAULT_USER_ID,
+                    help="세션 소유 사용자 id (겹침 검사도 이 사용자 기준, 기본 DEFAULT_USER_ID)")
+    ap.add_argument("--fast", action="store_true",
+                    help="mmap 컬럼 파서 사용(대용량 파일용). 형식 오류 줄 번호를 출력")
     args = ap.parse_args()
 
     print(f"[i] DEST (Neon) URL = {settings.DATABASE_URL}")
+    print(f"[i] user = {args.user}")
 
     if args.create_tables:
         print("[i] creating tables on destination (if not exists)…")
         SQLModel.metadata.create_all(dest_engine)
 
-    rows = list(parse_txt_lines(args.input))
-    print(f"[i] parsed rows: {len(rows)}")
+    if args.fast:
+        cols = parse_txt_columns(args.input)
+        if cols.skipped:
+            head = ", ".join(map(str, cols.skipped[:20]))
+            print(f"[!] malformed lines: {len(cols.skipped)} (line {head}{' …' if len(cols.skipped) > 20 else ''})")
+        # Row 는 업로드 루프에서 한 줄씩만 만듦(전체 목록을 만들지 않음)
+        rows, total = cols.rows(), len(cols)
+    else:
+        rows = list(parse_txt_lines(args.input))
+        total = len(rows)
+    print(f"[i] parsed rows: {total}")
     if args.dry_run:
-        for r in rows[:5]:
+        for r in islice(rows, 5):
             y = YEAR_BY_MONTH.get(r.month)
             st = to_iso_kst(y, r.month, r.day, r.sh, r.sm, args.assume_pm, args.tz)
             en = to_iso_kst(y, r.month, r.day, r.eh, r.em, args.assume_pm, args.tz)
@@ -147,8 +219,11 @@ def main():
 
     # 실제 업로드
     moved = 0
+    overlaps = 0
     with Session(dest_engine) as dst:
         batch_payload: List[Dict[str, Any]] = []
+        # 대상 DB의 기존 세션 + 이번에 넣는 세션을 메모리 구간 인덱스로 → 줄마다 O(log n) 겹침 검사
+        index = load_index(dst, args.user) if args.on_overlap != "allow" else None
 
         for r in rows:
             year = YEAR_BY_MONTH.get(r.month)
@@ -160,8 +235,21 @@ def main():
             en_iso = to_iso_kst(year, r.month, r.day, r.eh, r.em, args.assume_pm, args.tz)
             mins = minutes_between(st_iso, en_iso)
 
+            if index is not None:
+                st = datetime.fromisoformat(st_iso).replace(tzinfo=None)  # KST naive (DB 저장 기준)
+                en = st + timedelta(minutes=mins)
+                if not index.add(st, en):
+                    overlaps += 1
+                    cs, ce = index.conflict(st, en)
+                    msg = f"overlap: {st:%Y-%m-%d %H:%M} ~ {en:%H:%M} ↔ {cs:%Y-%m-%d %H:%M} ~ {ce:%H:%M}"
+                    if args.on_overlap == "error":
+                        raise ValueError(msg)
+                    print(f"  ! skip {msg}")
+                    continue
+
             batch_payload.append({
                 # id는 지정하지 않음(자동증가)
+                "user_id": args.user,
                 "started_at": st_iso,
                 "ended_at": en_iso,
                 "minutes": mins,
@@ -171,13 +259,16 @@ def main():
             if len(batch_payload) >= args.batch:
                 upsert_without_id(dst, batch_payload)
                 moved += len(batch_payload)
-                print(f"  - moved {moved}/{len(rows)}")
+                print(f"  - moved {moved}/{total}")
                 batch_payload.clear()
 
         if batch_payload:
             upsert_without_id(dst, batch_payload)
             moved += len(batch_payload)
-            print(f"  - moved {moved}/{len(rows)}")
+            print(f"  - moved {moved}/{total}")
+
+        if overlaps:
+            print(f"[!] skipped overlapping rows: {overlaps}")
 
         # 시퀀스 보정(혹시 수동 id를 넣는 경우 대비. 지금은 거의 noop)
         fix_pg_sequence(dst)